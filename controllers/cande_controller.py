@@ -2,14 +2,17 @@
 Main controller for CANDE Input File Editor.
 """
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Set, Any
 from enum import Enum, auto
 import logging
 
 from models.cande_model import CandeModel
 from models.element import Element1D, InterfaceElement
+from models.mesh_index import MeshIndex
 from views.main_window import MainWindow
 from views.canvas_view import CanvasView, DisplayMode
+from utils.constants import PAN_REDRAW_THRESHOLD, LASSO_POLL_INTERVAL, MOTION_UPDATE_INTERVAL
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -53,6 +56,23 @@ class CandeController:
         self.locked_cursor_x = 0
         self.locked_cursor_y = 0
 
+        # 1D element width, cached from the UI variable (updated in on_line_width_change)
+        self._line_width = self.main_window.line_width_var.get()
+
+        # Pending coalesced render (after_idle id), see schedule_render
+        self._render_pending = None
+
+        # Pending throttled selection box / coordinates updates (after ids) and the latest pointer position
+        self._drag_update_pending = None
+        self._coordinates_update_pending = None
+        self._pointer_position = (0, 0)
+
+        # Worker for lasso hit-testing, so large lassos don't block the UI
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+        # Bumped by every selection change, so a lasso result finishing after a newer selection is dropped
+        self._selection_generation = 0
+
         # Current display filter (None = show all)
         self.element_type_filter = None
         self.on_element_type_change()  # Initialize filter based on checkboxes
@@ -131,6 +151,7 @@ class CandeController:
             self.main_window.show_2d_var.set(True)
             self.main_window.show_interface_var.set(True)
 
+            self.canvas_view.invalidate_mesh()
             self.render_mesh()
 
             # Update status
@@ -154,15 +175,29 @@ class CandeController:
             return
 
         if self.model.save_file(save_path):
+            # Saving renumbers interface materials, so the mesh labels must be redrawn
+            self.canvas_view.invalidate_mesh()
             self.main_window.update_status(f"File saved as {save_path}")
             self.main_window.show_message("Success", "File saved successfully", "info")
         else:
             self.main_window.show_message("Error", f"Failed to save file: {save_path}", "error")
 
+    def schedule_render(self) -> None:
+        """Render the mesh once the event queue is idle, coalescing bursts of pan/zoom events into one render."""
+        if self._render_pending is None:
+            self._render_pending = self.main_window.root.after_idle(self._run_scheduled_render)
+
+    def _run_scheduled_render(self) -> None:
+        """Run the render requested by schedule_render."""
+        self._render_pending = None
+        self.render_mesh()
+
     def render_mesh(self) -> None:
         """Render the mesh on the canvas with the selected filter types."""
-        # Get the current line width value from the UI
-        current_line_width = self.main_window.line_width_var.get()
+        # A render now makes any scheduled one redundant
+        if self._render_pending is not None:
+            self.main_window.root.after_cancel(self._render_pending)
+            self._render_pending = None
 
         # Pass model reference to the canvas view for consistent interface coloring
         self.canvas_view.model = self.model
@@ -174,7 +209,8 @@ class CandeController:
             self.model.max_material,
             self.model.max_step,
             self.element_type_filter,
-            current_line_width
+            self._line_width,
+            mesh_index=self.model.mesh_index
         )
 
     def on_display_change(self, event: Any) -> None:
@@ -217,7 +253,7 @@ class CandeController:
 
     def on_line_width_change(self) -> None:
         """Handle line width changes for 1D elements."""
-        width = self.main_window.line_width_var.get()
+        width = self._line_width = self.main_window.line_width_var.get()
         logger.info(f"1D element width changed to {width}")
 
         # Update the rendering with the new width
@@ -232,6 +268,7 @@ class CandeController:
             material = int(self.main_window.material_var.get())
 
             # Select elements that match both the material and current element type filter
+            self._selection_generation += 1
             count = self.model.select_elements_by_material(
                 material,
                 element_type_filter=self.element_type_filter
@@ -250,7 +287,7 @@ class CandeController:
                 )
 
         except ValueError:
-            self.main_window.show_message("Error", "Please enter a valid material number", "error")
+            self.main_window.show_input_error("Please enter a valid material number")
 
     def select_by_step(self) -> None:
         """Select all elements with the specified step number."""
@@ -258,6 +295,7 @@ class CandeController:
             step = int(self.main_window.step_var.get())
 
             # Select elements that match both the step and current element type filter
+            self._selection_generation += 1
             count = self.model.select_elements_by_step(
                 step,
                 element_type_filter=self.element_type_filter
@@ -276,7 +314,7 @@ class CandeController:
                 )
 
         except ValueError:
-            self.main_window.show_message("Error", "Please enter a valid step number", "error")
+            self.main_window.show_input_error("Please enter a valid step number")
 
     def assign_to_selection(self) -> None:
         """Assign material and/or step to the selected elements."""
@@ -327,7 +365,9 @@ class CandeController:
                 element_ids_to_update=non_interface_elements  # Pass only non-interface elements
             )
 
-            self.render_mesh()
+            # Only the colors of the updated elements change, recolor them on the next coalesced render
+            self.canvas_view.invalidate_element_colors(non_interface_elements)
+            self.schedule_render()
 
             # Update status message
             msg_parts = []
@@ -347,7 +387,7 @@ class CandeController:
                 )
 
         except ValueError:
-            self.main_window.show_message("Error", "Please enter valid numbers", "error")
+            self.main_window.show_input_error("Please enter valid numbers")
 
     def on_canvas_click(self, event: Any) -> None:
         """
@@ -408,7 +448,16 @@ class CandeController:
             else:
                 self.lasso_direction = LassoDirection.RIGHT_TO_LEFT
 
-            # Update the selection box
+            # Redraw the selection box at most once per interval, at the latest cursor position
+            if self._drag_update_pending is None:
+                self._drag_update_pending = self.main_window.root.after(
+                    MOTION_UPDATE_INTERVAL, self._update_selection_box
+                )
+
+    def _update_selection_box(self) -> None:
+        """Draw the selection box scheduled by on_canvas_drag."""
+        self._drag_update_pending = None
+        if self.is_dragging:
             self.canvas_view.draw_selection_box(
                 self.drag_start_x, self.drag_start_y,
                 self.locked_cursor_x, self.locked_cursor_y
@@ -427,15 +476,15 @@ class CandeController:
         self.is_dragging = False
         self.canvas_view.is_dragging = False
         elements_selected = False  # Track if any elements were successfully selected
+        self._selection_generation += 1
 
         # If we have a small drag distance, treat it as a click
         if (abs(event.x - self.drag_start_x) < 5 and
                 abs(event.y - self.drag_start_y) < 5):
             # Find the element under the cursor
-            current_line_width = self.main_window.line_width_var.get()
             element_id = self.canvas_view.find_element_at_position(
                 event.x, event.y, self.model.nodes, self.model.elements, self.element_type_filter,
-                current_line_width
+                self._line_width, mesh_index=self.model.mesh_index
             )
             if element_id is not None:
                 elements_selected = True
@@ -460,25 +509,79 @@ class CandeController:
             model_min_x, model_max_y = self.canvas_view.screen_to_model(min_x, min_y)
             model_max_x, model_min_y = self.canvas_view.screen_to_model(max_x, max_y)
 
-            # Collect elements in the lasso selection
-            selected_in_lasso = self._find_elements_in_lasso(
-                model_min_x, model_min_y, model_max_x, model_max_y
+            # Collect elements in the lasso selection on the worker, the result is applied when ready.
+            # The worker only gets state captured here, never the (mutable) controller attributes
+            selection_mode = self.selection_mode
+            mesh_index = self.model.mesh_index
+            future = self._executor.submit(
+                self._find_elements_in_lasso, mesh_index, model_min_x, model_min_y, model_max_x, model_max_y,
+                self.lasso_direction, self.element_type_filter
             )
 
-            if selected_in_lasso:
-                elements_selected = True
-                if self.selection_mode == SelectionMode.NEW:
-                    # Replace current selection
-                    self.model.selected_elements = selected_in_lasso
-                elif self.selection_mode == SelectionMode.ADD:
-                    # Add to existing selection
-                    self.model.selected_elements.update(selected_in_lasso)
-                elif self.selection_mode == SelectionMode.REMOVE:
-                    # Remove from selection
-                    self.model.selected_elements.difference_update(selected_in_lasso)
+            self.selection_mode = SelectionMode.NONE
+            self.canvas_view.canvas.delete("selection_box")
+            self.main_window.update_status("Selecting...")
+            self._poll_lasso_result(future, selection_mode, mesh_index, self._selection_generation)
+            return
+
+        self._finish_selection(self.selection_mode, elements_selected)
+
+    def _poll_lasso_result(self, future: Future, selection_mode: SelectionMode, mesh_index: MeshIndex,
+                           generation: int) -> None:
+        """
+        Apply a lasso selection computed on the worker once it is done (runs on the Tk main thread).
 
+        Args:
+            future: Future returning the set of element IDs within the lasso
+            selection_mode: Selection mode at the time the lasso was released
+            mesh_index: Mesh index of the model the lasso was computed for
+            generation: Selection generation the lasso was started in
+        """
+        if not future.done():
+            self.main_window.root.after(LASSO_POLL_INTERVAL, self._poll_lasso_result,
+                                        future, selection_mode, mesh_index, generation)
+            return
+
+        # Drop results overtaken by a newer selection (which reports its own status)
+        if generation != self._selection_generation:
+            return
+
+        # Drop results for a mesh that has since been reloaded or changed
+        if mesh_index is not self.model.mesh_index:
+            self.main_window.update_status("Selection discarded: the model changed")
+            return
+
+        try:
+            selected_in_lasso = future.result()
+        except Exception as e:
+            logger.error(f"Error in lasso selection: {str(e)}")
+            selected_in_lasso = set()
+
+        elements_selected = False
+        if selected_in_lasso:
+            elements_selected = True
+            if selection_mode == SelectionMode.NEW:
+                # Replace current selection
+                self.model.selected_elements = selected_in_lasso
+            elif selection_mode == SelectionMode.ADD:
+                # Add to existing selection
+                self.model.selected_elements.update(selected_in_lasso)
+            elif selection_mode == SelectionMode.REMOVE:
+                # Remove from selection
+                self.model.selected_elements.difference_update(selected_in_lasso)
+
+        self._finish_selection(selection_mode, elements_selected)
+
+    def _finish_selection(self, selection_mode: SelectionMode, elements_selected: bool) -> None:
+        """
+        Complete a click or lasso selection: clear on empty NEW selections, redraw and report.
+
+        Args:
+            selection_mode: Selection mode the selection was made with
+            elements_selected: Whether any elements were hit
+        """
         # Only clear selection if in NEW mode and nothing was selected
-        if self.selection_mode == SelectionMode.NEW and not elements_selected:
+        if selection_mode == SelectionMode.NEW and not elements_selected:
             # Clicking in empty space clears selection
             self.model.selected_elements.clear()
 
@@ -492,79 +595,54 @@ class CandeController:
         # Update status
         self.main_window.update_status(f"Selected {len(self.model.selected_elements)} elements")
 
-    def element_matches_filter(self, model, element) -> bool:
-        """
-        Check if an element matches the current type filter list.
-
-        Args:
-            model: The CandeModel instance
-            element: The element to check
-
-        Returns:
-            True if the element matches any filter in the list or if the list is empty
-        """
-        # If filter is None (legacy "All" selection), show everything
-        if self.element_type_filter is None:
-            return True
-
-        # If filter is empty list, show nothing
-        if self.element_type_filter == []:
-            return False
-
-        # Check if element type is in the filter list
-        for filter_type in self.element_type_filter:
-            if model.element_matches_filter(element, filter_type):
-                return True
-
-        return False
-
-    def _find_elements_in_lasso(self, min_x: float, min_y: float,
-                                max_x: float, max_y: float) -> Set[int]:
+    @staticmethod
+    def _find_elements_in_lasso(mesh_index: MeshIndex, min_x: float, min_y: float,
+                                max_x: float, max_y: float, lasso_direction: LassoDirection,
+                                element_type_filter) -> Set[int]:
         """
-        Find elements within the lasso selection box.
+        Find elements within the lasso selection box (runs on the worker thread).
 
         Args:
+            mesh_index: Mesh index of the model
             min_x: Minimum X coordinate
             min_y: Minimum Y coordinate
             max_x: Maximum X coordinate
             max_y: Maximum Y coordinate
+            lasso_direction: Direction the lasso was drawn in (window or crossing selection)
+            element_type_filter: Element type filter at the time the lasso was released
 
         Returns:
             Set of element IDs within the lasso
         """
         selected_elements = set()
-
-        for element_id, element in self.model.elements.items():
+        node_x = mesh_index.node_x
+        node_y = mesh_index.node_y
+        element_min_x = mesh_index.element_min_x
+        element_min_y = mesh_index.element_min_y
+        element_max_x = mesh_index.element_max_x
+        element_max_y = mesh_index.element_max_y
+        window_selection = lasso_direction == LassoDirection.LEFT_TO_RIGHT
+        matches_filter = mesh_index.filter_mask(element_type_filter)
+
+        # Any element touching the lasso must have its bounding box overlap it
+        for row in mesh_index.query_box(min_x, min_y, max_x, max_y):
             # Skip elements that don't match the current filter
-            # FIXED: Use self.element_matches_filter instead of model.element_matches_filter
-            if not self.element_matches_filter(self.model, element):
+            if not matches_filter[row]:
                 continue
 
-            element_nodes = [self.model.nodes[node_id] for node_id in element.nodes
-                             if node_id in self.model.nodes]
+            # All nodes are inside exactly when the bounding box is inside
+            is_inside = (min_x <= element_min_x[row] and element_max_x[row] <= max_x and
+                         min_y <= element_min_y[row] and element_max_y[row] <= max_y)
 
-            # Skip if we don't have valid nodes
-            if not element_nodes:
-                continue
-
-            # Check selection criteria based on lasso direction
-            is_inside = False
-
-            if self.lasso_direction == LassoDirection.LEFT_TO_RIGHT:
-                # Window selection (all nodes must be inside)
-                is_inside = all(
-                    min_x <= node.x <= max_x and min_y <= node.y <= max_y
-                    for node in element_nodes
-                )
-            else:  # RIGHT_TO_LEFT
+            if not is_inside and not window_selection:
                 # Crossing selection (any node inside is enough)
                 is_inside = any(
-                    min_x <= node.x <= max_x and min_y <= node.y <= max_y
-                    for node in element_nodes
+                    min_x <= node_x[node_row] <= max_x and min_y <= node_y[node_row] <= max_y
+                    for node_row in mesh_index.element_node_indices[row]
                 )
 
             if is_inside:
-                selected_elements.add(element_id)
+                selected_elements.add(mesh_index.element_ids[row])
 
         return selected_elements
 
@@ -575,7 +653,17 @@ class CandeController:
         Args:
             event: The event that triggered the move
         """
-        model_x, model_y = self.canvas_view.screen_to_model(event.x, event.y)
+        # Update the coordinates display at most once per interval, for the latest position
+        self._pointer_position = (event.x, event.y)
+        if self._coordinates_update_pending is None:
+            self._coordinates_update_pending = self.main_window.root.after(
+                MOTION_UPDATE_INTERVAL, self._update_coordinates
+            )
+
+    def _update_coordinates(self) -> None:
+        """Show the model coordinates of the pointer position recorded by on_mouse_move."""
+        self._coordinates_update_pending = None
+        model_x, model_y = self.canvas_view.screen_to_model(*self._pointer_position)
         self.main_window.update_coordinates(model_x, model_y)
 
     def on_mouse_wheel(self, event: Any) -> None:
@@ -605,8 +693,8 @@ class CandeController:
         self.canvas_view.pan_offset_x += event.x - new_screen_x
         self.canvas_view.pan_offset_y -= (event.y - new_screen_y)  # Y is inverted
 
-        # Redraw the mesh with new zoom level and pan offset
-        self.render_mesh()
+        # Redraw the mesh with new zoom level and pan offset once pending wheel events are handled
+        self.schedule_render()
 
         # Update status to show current zoom level
         zoom_percent = int(self.canvas_view.zoom_level * 100)
@@ -633,6 +721,10 @@ class CandeController:
         dx = event.x - self.drag_start_x
         dy = event.y - self.drag_start_y
 
+        # Ignore jitter; small deltas keep accumulating against the drag start position
+        if abs(dx) + abs(dy) <= PAN_REDRAW_THRESHOLD:
+            return
+
         # Update pan offset
         self.canvas_view.pan_offset_x += dx
         self.canvas_view.pan_offset_y -= dy  # Invert Y for proper panning
@@ -641,8 +733,8 @@ class CandeController:
         self.drag_start_x = event.x
         self.drag_start_y = event.y
 
-        # Redraw with the new pan offset
-        self.render_mesh()
+        # Redraw with the new pan offset once pending motion events are handled
+        self.schedule_render()
 
     def on_escape(self, event: Any) -> None:
         """
@@ -651,6 +743,7 @@ class CandeController:
         Args:
             event: The event that triggered the escape
         """
+        self._selection_generation += 1
         self.model.selected_elements.clear()
         self.render_mesh()
         self.main_window.update_status("Selection cleared")
@@ -700,6 +793,7 @@ class CandeController:
         count, all_nodes_have_interfaces = self.model.create_interfaces(self.model.selected_elements, friction)
 
         if count > 0:
+            self.canvas_view.invalidate_mesh()
             self.render_mesh()
             self.main_window.update_status(f"Created {count} interface elements with friction {friction:.2f}")
             self.main_window.show_message(
@@ -3,16 +3,19 @@ Main model class for CANDE Input File Editor.
 Handles data structures and operations for CANDE input files, including
 nodes, elements, and enhanced interface element support with material properties.
 """
+import locale
+import os
 import re
-from typing import Dict, List, Set, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Set, Optional, Tuple
 import logging
 import math
 
 from models.node import Node
 from models.element import BaseElement, Element1D, Element2D, InterfaceElement
+from models.mesh_index import MeshIndex
 from utils.constants import (
     MATERIAL_START_POS, MATERIAL_END_POS, MATERIAL_FIELD_WIDTH,
-    STEP_START_POS, STEP_END_POS, STEP_FIELD_WIDTH
+    STEP_START_POS, STEP_END_POS, STEP_FIELD_WIDTH, FILE_BUFFER_SIZE
 )
 
 # Configure logging
@@ -29,6 +32,109 @@ ELEMENT_TYPE_DICT = {
     4: Element2D,  # 4-node elements are also 2D elements
 }
 
+# Node pattern - match any line with node ID followed by X and Y coordinates
+NODE_PATTERN = re.compile(r'^\s*C-3\.L3!![ L]+(\d+)\s+\w+\s+(-?[\d.]+)\s+(-?[\d.]+)')
+
+# Element pattern - more flexible to catch all element types
+# Look for lines that have the C-4.L3!! marker (or similar) and extract all numbers
+ELEMENT_PATTERN = re.compile(
+    r'^\s*C-4\.L3!![ L]+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)(?:\s+(\d+))?'
+)
+
+# Interface material definition lines (D-1 material ID, D-2.Interface angle and friction)
+D1_PATTERN = re.compile(r'D-1!![ L]+(\d+)')
+D2_INTERFACE_PATTERN = re.compile(r'D-2\.Interface!![ ]*(-?[\d.]+)[ ]*(-?[\d.]+)')
+
+# Last-line ("!!L") markers and section lines used to find insertion points when saving
+LAST_NODE_PATTERN = re.compile(r'^\s*C-3\.L3!!L')
+LAST_ELEMENT_PATTERN = re.compile(r'^\s*C-4\.L3!!L')
+D_LINE_PATTERN = re.compile(r'^\s*D-\d+.*!!.')  # Match any D line with a character after !!
+LAST_C5_PATTERN = re.compile(r'^\s*C-5.*!!L')
+LAST_C4_PATTERN = re.compile(r'^\s*C-4.*!!L')
+C2_MARKER_PATTERN = re.compile(r'C-2\.L3!!')
+
+# Node and element lines as written by CANDE-2019 (marker at column 20, data fields after it)
+NODE_LINE_PREFIX = " " * 19 + "C-3.L3!!"
+ELEMENT_LINE_PREFIX = " " * 19 + "C-4.L3!!"
+FIELDS_START_POS = len(NODE_LINE_PREFIX) + 1  # After the " " / "L" that follows the marker
+
+
+def _is_plain_number(value: str) -> bool:
+    """Check that a field is an optionally negative run of digits and decimal points."""
+    if value[:1] == "-":
+        value = value[1:]
+    return value.replace(".", "").isdecimal()
+
+
+def _parse_node_line(line: str) -> Optional[Tuple[int, float, float]]:
+    """
+    Parse a node line in the standard layout without a regex.
+
+    Args:
+        line: Line from the input file
+
+    Returns:
+        Tuple of (node_id, x, y), or None if the line is not a plain standard node line
+    """
+    # Sliced, so a line holding only the marker (e.g. a last line without newline) is rejected, not an IndexError
+    if not line.startswith(NODE_LINE_PREFIX) or line[FIELDS_START_POS - 1:FIELDS_START_POS] not in (" ", "L"):
+        return None
+
+    # The ID has to follow the marker directly, separated by blanks (or the "L" flag) only
+    data = line[FIELDS_START_POS:].lstrip(" L")
+    if not data[:1].isdecimal():
+        return None
+
+    fields = data.split(None, 4)
+    if len(fields) < 4:
+        return None
+
+    node_id, flags, x, y = fields[:4]
+    if not (node_id.isdecimal() and flags.replace("_", "").isalnum()
+            and _is_plain_number(x) and _is_plain_number(y)):
+        return None
+
+    try:
+        return int(node_id), float(x), float(y)
+    except ValueError:
+        return None
+
+
+def _parse_element_line(line: str) -> Optional[Tuple[int, ...]]:
+    """
+    Parse an element line in the standard layout without a regex.
+
+    Args:
+        line: Line from the input file
+
+    Returns:
+        Tuple of (element_id, node1, node2, node3, node4, material, step, element_class),
+        or None if the line is not a plain standard element line
+    """
+    # Sliced, so a line holding only the marker (e.g. a last line without newline) is rejected, not an IndexError
+    if not line.startswith(ELEMENT_LINE_PREFIX) or line[FIELDS_START_POS - 1:FIELDS_START_POS] not in (" ", "L"):
+        return None
+
+    # The ID has to follow the marker directly, separated by blanks (or the "L" flag) only
+    data = line[FIELDS_START_POS:].lstrip(" L")
+    if not data[:1].isdecimal():
+        return None
+
+    fields = data.split(None, 8)
+    if len(fields) < 7:
+        return None
+
+    # The element class is optional
+    if len(fields) == 7:
+        fields.append("0")
+    del fields[8:]
+
+    for field in fields:
+        if not field.isdecimal():
+            return None
+
+    return tuple(map(int, fields))
+
 
 class CandeModel:
     """Model class that handles CANDE data and operations."""
@@ -41,6 +147,12 @@ class CandeModel:
         self.selected_elements: Set[int] = set()
         self.file_content: List[str] = []
 
+        # Elements whose line_content may differ from their line in file_content (rewritten on save)
+        self._dirty_elements: Set[int] = set()
+
+        # Flat geometry index used for rendering and hit-testing (rebuilt when the mesh changes)
+        self.mesh_index: MeshIndex = MeshIndex(self.nodes, self.elements)
+
         # Dictionary to store interface materials mapping (material_id -> (friction, angle))
         self.interface_materials: Dict[int, Tuple[float, float]] = {}
 
@@ -68,11 +180,12 @@ class CandeModel:
             True if file was loaded successfully, False otherwise
         """
         try:
-            with open(filepath, 'r') as file:
-                self.file_content = file.readlines()
+            # Parse while streaming the file through a large buffer instead of reading it first
+            with open(filepath, 'r', buffering=FILE_BUFFER_SIZE) as file:
+                self.parse_cande_file(file)
 
             self.filepath = filepath
-            self.parse_cande_file()
+            self.rebuild_mesh_index()
             self.calculate_model_extents()
             self.selected_elements.clear()
             logger.info(f"Successfully loaded {filepath}")
@@ -81,34 +194,71 @@ class CandeModel:
             logger.error(f"Error loading file: {str(e)}")
             return False
 
-    def parse_cande_file(self) -> None:
-        """Parse the CANDE input file to extract nodes and elements."""
-        self.nodes.clear()
-        self.elements.clear()
-
-        # Clear and parse interface materials
-        self.interface_materials.clear()
-        self.interface_materials = self._parse_interface_materials()
+    def parse_cande_file(self, lines: Optional[Iterable[str]] = None) -> None:
+        """
+        Parse the CANDE input file to extract nodes, elements and interface materials.
 
-        # More general patterns to catch nodes and elements
-        # Node pattern - match any line with node ID followed by X and Y coordinates
-        node_pattern = re.compile(r'^\s*C-3\.L3!![ L]+(\d+)\s+\w+\s+(-?[\d.]+)\s+(-?[\d.]+)')
+        All data is collected in a single pass over the lines.
 
-        # Element pattern - more flexible to catch all element types
-        # Look for lines that have the C-4.L3!! marker (or similar) and extract all numbers
-        element_pattern = re.compile(
-            r'^\s*C-4\.L3!![ L]+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)(?:\s+(\d+))?'
-        )
+        The lines are parsed into new containers that replace the model data only once every
+        line was read, so a read error (e.g. an undecodable byte in a streamed file) leaves the
+        model unchanged.
 
-        for line_num, line in enumerate(self.file_content):
-            # Check if this is a node line
-            node_match = node_pattern.match(line)
-            if node_match:
-                node_id = int(node_match.group(1))
-                x = float(node_match.group(2))
-                y = float(node_match.group(3))
-
-                self.nodes[node_id] = Node(
+        Args:
+            lines: Lines to parse (e.g. an open file); the current file content is parsed if omitted.
+                When given, the lines are stored as the new file content.
+        """
+        if lines is None:
+            lines = list(self.file_content)
+        file_content: List[str] = []
+        nodes: Dict[int, Node] = {}
+        elements: Dict[int, BaseElement] = {}
+        interface_materials: Dict[int, Tuple[float, float]] = {}
+        max_material = self.max_material
+        max_step = self.max_step
+        interface_elements: List[InterfaceElement] = []
+        elements_2d: List[Element2D] = []
+        d1_material_id: Optional[int] = None
+
+        # Bind the module-level pattern methods once for the loop
+        node_match_line = NODE_PATTERN.match
+        element_match_line = ELEMENT_PATTERN.match
+        d1_search = D1_PATTERN.search
+        d2_search = D2_INTERFACE_PATTERN.search
+
+        for line_num, line in enumerate(lines):
+            file_content.append(line)
+
+            # Check for a D-2.Interface line following a D-1 line (interface material definition)
+            if d1_material_id is not None and "D-2.Interface!!" in line:
+                # Parse angle and friction values
+                d2_match = d2_search(line)
+                if d2_match:
+                    angle = float(d2_match.group(1))
+                    friction = float(d2_match.group(2))
+                    # Store in interface materials dictionary
+                    interface_materials[d1_material_id] = (friction, angle)
+                    logger.info(
+                        f"Found interface material {d1_material_id} with friction={friction}, angle={angle}")
+            d1_material_id = None
+
+            # Check for D-1 lines and remember the material ID for the next line
+            if "D-1!!" in line:
+                d1_match = d1_search(line)
+                if d1_match:
+                    d1_material_id = int(d1_match.group(1))
+
+            # Check if this is a node line (standard layout first, regex for other layouts)
+            node_values = _parse_node_line(line)
+            if node_values is None and "C-3.L3!!" in line:
+                node_match = node_match_line(line)
+                if node_match:
+                    node_values = (int(node_match.group(1)), float(node_match.group(2)),
+                                   float(node_match.group(3)))
+            if node_values:
+                node_id, x, y = node_values
+
+                nodes[node_id] = Node(
                     node_id=node_id,
                     x=x,
                     y=y,
@@ -117,17 +267,14 @@ class CandeModel:
                 )
                 continue
 
-            # Check if this is an element line
-            element_match = element_pattern.match(line)
-            if element_match:
-                element_id = int(element_match.group(1))
-                node1 = int(element_match.group(2))
-                node2 = int(element_match.group(3))
-                node3 = int(element_match.group(4))
-                node4 = int(element_match.group(5))
-                material = int(element_match.group(6))
-                step = int(element_match.group(7))
-                element_class = int(element_match.group(8)) if element_match.group(8) else 0
+            # Check if this is an element line (standard layout first, regex for other layouts)
+            element_values = _parse_element_line(line)
+            if element_values is None and "C-4.L3!!" in line:
+                element_match = element_match_line(line)
+                if element_match:
+                    element_values = tuple(int(group) if group else 0 for group in element_match.groups())
+            if element_values:
+                element_id, node1, node2, node3, node4, material, step, element_class = element_values
 
                 # Count actual nodes (non-zero)
                 node_ids = [n for n in [node1, node2, node3, node4] if n != 0]
@@ -145,23 +292,14 @@ class CandeModel:
                         line_content=line,
                     )
 
-                    # Set friction and angle if available from interface materials
-                    if material in self.interface_materials:
-                        friction, angle = self.interface_materials[material]
-                        element.friction = friction
-                        element.angle = angle
-                        logger.info(
-                            f"Set interface element {element_id} with material {material}: friction={friction}, angle={angle}")
-                    else:
-                        logger.warning(
-                            f"Interface element {element_id} uses material {material}, but no material definition found")
-
-                    self.elements[element_id] = element
+                    # Friction and angle are set once all interface materials are known
+                    interface_elements.append(element)
+                    elements[element_id] = element
 
                 elif node_count in ELEMENT_TYPE_DICT:
                     element_type = ELEMENT_TYPE_DICT[node_count]
 
-                    self.elements[element_id] = element_type(
+                    element = element_type(
                         element_id=element_id,
                         nodes=node_ids,
                         material=material,
@@ -169,75 +307,65 @@ class CandeModel:
                         line_number=line_num,
                         line_content=line,
                     )
+                    elements[element_id] = element
 
-                    if isinstance(self.elements[element_id], Element2D):
-                        self.ensure_valid_2d_element_ordering(self.elements[element_id])
+                    # Node ordering is checked once the new nodes are in place
+                    if isinstance(element, Element2D):
+                        elements_2d.append(element)
                 else:
                     logger.warning(
                         f"Unknown element type: ID={element_id}, node_count={node_count}, class={element_class}")
                     continue  # Skip this element
 
                 # Update max material and step numbers
-                self.max_material = max(self.max_material, material)
-                self.max_step = max(self.max_step, step)
+                max_material = max(max_material, material)
+                max_step = max(max_step, step)
+
+        # Every line was read: replace the model data
+        self.file_content = file_content
+        self.nodes = nodes
+        self.elements = elements
+        self.interface_materials = interface_materials
+        self._dirty_elements.clear()
+        self.max_material = max_material
+        self.max_step = max_step
+
+        for element in elements_2d:
+            self.ensure_valid_2d_element_ordering(element)
+
+        # Set friction and angle if available from interface materials
+        for element in interface_elements:
+            if element.material in self.interface_materials:
+                friction, angle = self.interface_materials[element.material]
+                element.friction = friction
+                element.angle = angle
+                logger.info(
+                    f"Set interface element {element.element_id} with material {element.material}: "
+                    f"friction={friction}, angle={angle}")
+            else:
+                logger.warning(
+                    f"Interface element {element.element_id} uses material {element.material}, "
+                    f"but no material definition found")
 
         logger.info(f"Loaded {len(self.nodes)} nodes and {len(self.elements)} elements")
         logger.info(f"Loaded {len(self.interface_materials)} interface materials")
 
-    def _parse_interface_materials(self) -> Dict[int, Tuple[float, float]]:
-        """
-        Parse interface material definitions from the CANDE file.
-
-        Returns:
-            Dictionary mapping material_id to (friction, angle)
-        """
-        interface_materials = {}
-
-        i = 0
-        while i < len(self.file_content):
-            line = self.file_content[i]
-
-            # Check for D-1 lines (interface material definition)
-            if "D-1!!" in line:
-                # Extract material ID
-                d1_match = re.search(r'D-1!![ L]+(\d+)', line)
-                if d1_match:
-                    material_id = int(d1_match.group(1))
-
-                    # Check if the next line is a D-2.Interface line
-                    if i + 1 < len(self.file_content) and "D-2.Interface!!" in self.file_content[i + 1]:
-                        d2_line = self.file_content[i + 1]
-                        # Parse angle and friction values
-                        d2_match = re.search(r'D-2\.Interface!![ ]*(-?[\d.]+)[ ]*(-?[\d.]+)', d2_line)
-                        if d2_match:
-                            angle = float(d2_match.group(1))
-                            friction = float(d2_match.group(2))
-                            # Store in interface materials dictionary
-                            interface_materials[material_id] = (friction, angle)
-                            logger.info(
-                                f"Found interface material {material_id} with friction={friction}, angle={angle}")
-            i += 1
-
-        return interface_materials
+    def rebuild_mesh_index(self) -> None:
+        """Rebuild the flat geometry index after nodes or element connectivity changed."""
+        self.mesh_index = MeshIndex(self.nodes, self.elements)
 
     def calculate_model_extents(self) -> None:
-        """Calculate the extents of the model for zooming."""
+        """Calculate the extents of the model for zooming (expects an up-to-date mesh index)."""
         if not self.nodes:
             return
 
-        # Initialize with the first node
-        first_node = next(iter(self.nodes.values()))
-        self.model_min_x = first_node.x
-        self.model_max_x = first_node.x
-        self.model_min_y = first_node.y
-        self.model_max_y = first_node.y
-
-        # Check all nodes
-        for node in self.nodes.values():
-            self.model_min_x = min(self.model_min_x, node.x)
-            self.model_max_x = max(self.model_max_x, node.x)
-            self.model_min_y = min(self.model_min_y, node.y)
-            self.model_max_y = max(self.model_max_y, node.y)
+        # Reduce the flat coordinate arrays (min/max run in C over the lists)
+        node_x = self.mesh_index.node_x
+        node_y = self.mesh_index.node_y
+        self.model_min_x = min(node_x)
+        self.model_max_x = max(node_x)
+        self.model_min_y = min(node_y)
+        self.model_max_y = max(node_y)
 
     def save_file(self, save_path: str) -> bool:
         """
@@ -256,16 +384,15 @@ class CandeModel:
         # Copy file content for modification
         new_file_content = list(self.file_content)
 
-        # Update existing elements' node references
-        for element_id, element in self.elements.items():
-            if element.line_number >= 0:  # Only update existing elements in the file
+        # Update existing elements' node references (only elements edited since loading can differ)
+        for element_id in list(self._dirty_elements):
+            element = self.elements.get(element_id)
+            if element is not None and element.line_number >= 0:  # Only update existing elements in the file
                 # Check if we need to update the line (compare with original content)
                 original_line = self.file_content[element.line_number]
                 if original_line != element.line_content:
                     # Generate updated element line
-                    pattern = re.compile(
-                        r'^\s*C-4\.L3!![ L]+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)(?:\s+(\d+))?')
-                    match = pattern.match(original_line)
+                    match = ELEMENT_PATTERN.match(original_line)
 
                     if match:
                         # Extract element ID (group 1) and everything after the node IDs
@@ -297,6 +424,10 @@ class CandeModel:
         # Generate interface material lines and update elements
         interface_material_mapping, interface_material_lines = self._generate_interface_material_lines()
 
+        # Interface materials were renumbered in memory, so the cached material arrays must follow
+        if interface_material_mapping:
+            self.mesh_index.refresh_materials()
+
         # Update existing interface elements in the file with new material IDs
         for element_id, material_id in interface_material_mapping.items():
             if element_id in self.elements:
@@ -321,6 +452,7 @@ class CandeModel:
                     new_line = prefix + material_str + suffix
                     new_file_content[element.line_number] = new_line
                     element.line_content = new_line
+                    self._dirty_elements.add(element_id)
 
         # Find all interface elements in geometric order
         interface_elements = []
@@ -346,17 +478,15 @@ class CandeModel:
         if new_node_lines or new_element_lines:
             # Code to insert nodes and elements
             last_node_line = -1
-            node_pattern = re.compile(r'^\s*C-3\.L3!!L')
 
             # Element handling code...
             last_element_line = -1
-            element_pattern = re.compile(r'^\s*C-4\.L3!!L')
 
             for i, line in enumerate(new_file_content):
-                if node_pattern.match(line):
+                if LAST_NODE_PATTERN.match(line):
                     last_node_line = i
                     continue
-                if element_pattern.match(line):
+                if LAST_ELEMENT_PATTERN.match(line):
                     last_element_line = i
                     break
 
@@ -393,29 +523,26 @@ class CandeModel:
 
             # 1. Try to find existing "D-1!!" lines
             existing_d1_line = -1
-            existing_d_pattern = re.compile(r'^\s*D-\d+.*!!.')  # Match any D line with a character after !!
 
             for i, line in enumerate(new_file_content):
                 if "D-1!!" in line:
                     existing_d1_line = i
 
                 # Find the last D-n line to insert after it
-                if existing_d_pattern.match(line):
+                if D_LINE_PATTERN.match(line):
                     insertion_index = i
 
             # 2. If no D lines found, find C-5 lines
             if insertion_index < 0:
-                c5_pattern = re.compile(r'^\s*C-5.*!!L')
                 for i, line in enumerate(new_file_content):
-                    if c5_pattern.match(line):
+                    if LAST_C5_PATTERN.match(line):
                         insertion_index = i
                         break
 
             # 3. If no C-5 lines, find the last C-4 line
             if insertion_index < 0:
-                c4_pattern = re.compile(r'^\s*C-4.*!!L')
                 for i, line in enumerate(new_file_content):
-                    if c4_pattern.match(line):
+                    if LAST_C4_PATTERN.match(line):
                         insertion_index = i
                         break
 
@@ -436,10 +563,14 @@ class CandeModel:
         # Update the C-2 line with current counts before saving
         new_file_content = self._update_c2_line(new_file_content)
 
-        # Save the modified content
+        # Save the modified content as one encoded buffer with a single binary write,
+        # applying the same newline translation and encoding as a text-mode write
+        data = ''.join(new_file_content)
+        if os.linesep != '\n':
+            data = data.replace('\n', os.linesep)
         try:
-            with open(save_path, 'w') as file:
-                file.writelines(new_file_content)
+            with open(save_path, 'wb') as file:
+                file.write(data.encode(locale.getpreferredencoding(False)))
             return True
         except Exception as e:
             logger.error(f"Error saving file: {str(e)}")
@@ -476,7 +607,7 @@ class CandeModel:
             return file_content
 
         # Find the position right after "C-2.L3!!"
-        prefix_match = re.search(r'C-2\.L3!!', c2_line)
+        prefix_match = C2_MARKER_PATTERN.search(c2_line)
         if not prefix_match:
             logger.warning(f"Could not identify C-2.L3!! marker in line: {c2_line}")
             return file_content
@@ -607,26 +738,8 @@ class CandeModel:
         Returns:
             Number of elements selected
         """
-        count = 0
-        for element_id, element in self.elements.items():
-            # Handle both single filter string and list of filter strings
-            if isinstance(element_type_filter, list):
-                # Check if the element matches any filter in the list
-                matches_filter = False
-                for filter_type in element_type_filter:
-                    if self.element_matches_filter(element, filter_type):
-                        matches_filter = True
-                        break
-
-                if not matches_filter:
-                    continue
-            elif not self.element_matches_filter(element, element_type_filter):
-                continue
-
-            if element.material == material:
-                self.selected_elements.add(element_id)
-                count += 1
-        return count
+        rows = [row for row, value in enumerate(self.mesh_index.element_materials) if value == material]
+        return self._select_rows(rows, element_type_filter)
 
     def select_elements_by_step(self, step, element_type_filter=None) -> int:
         """
@@ -639,27 +752,56 @@ class CandeModel:
         Returns:
             Number of elements selected
         """
-        count = 0
-        for element_id, element in self.elements.items():
-            # Handle both single filter string and list of filter strings
-            if isinstance(element_type_filter, list):
-                # Check if the element matches any filter in the list
-                matches_filter = False
-                for filter_type in element_type_filter:
-                    if self.element_matches_filter(element, filter_type):
-                        matches_filter = True
-                        break
+        rows = [row for row, value in enumerate(self.mesh_index.element_steps) if value == step]
+        return self._select_rows(rows, element_type_filter)
 
-                if not matches_filter:
-                    continue
-            elif not self.element_matches_filter(element, element_type_filter):
+    def _select_rows(self, rows: List[int], element_type_filter=None) -> int:
+        """
+        Add the elements at the given mesh index rows to the selection, honoring the type filter.
+
+        Args:
+            rows: Element rows in the mesh index
+            element_type_filter: Filter for element types, can be None, a string, or a list of strings
+
+        Returns:
+            Number of elements selected
+        """
+        count = 0
+        element_ids = self.mesh_index.element_ids
+        # Handles both single filter string and list of filter strings
+        matches_filter = self.mesh_index.filter_mask(element_type_filter)
+        for row in rows:
+            if not matches_filter[row]:
                 continue
 
-            if element.step == step:
-                self.selected_elements.add(element_id)
-                count += 1
+            self.selected_elements.add(element_ids[row])
+            count += 1
         return count
 
+    @staticmethod
+    def _get_field_splicer(material_str: Optional[str], step_str: Optional[str]) -> Callable[[str], str]:
+        """
+        Build a function writing the given material and/or step field text into an element line.
+
+        Slicing clamps to the line length, so short lines need no special casing.
+
+        Args:
+            material_str: Right-aligned material field text, or None to keep the material
+            step_str: Right-aligned step field text, or None to keep the step
+
+        Returns:
+            Function mapping an element line to the updated line
+        """
+        if material_str is not None and step_str is not None:
+            # Rebuild the line in one join
+            return lambda line: ''.join((line[:MATERIAL_START_POS], material_str,
+                                         line[MATERIAL_END_POS:STEP_START_POS], step_str, line[STEP_END_POS:]))
+        if material_str is not None:
+            return lambda line: line[:MATERIAL_START_POS] + material_str + line[MATERIAL_END_POS:]
+        if step_str is not None:
+            return lambda line: line[:STEP_START_POS] + step_str + line[STEP_END_POS:]
+        return lambda line: line
+
     def update_elements(self, material=None, step=None, element_type_filter=None, element_ids_to_update=None) -> int:
         """
         Update the material and/or step of selected elements.
@@ -679,26 +821,25 @@ class CandeModel:
 
         updated_count = 0
 
+        # Right-aligned field text is the same for every element (only the last chars are kept if too long)
+        material_str = f"{material:>{MATERIAL_FIELD_WIDTH}}"[-MATERIAL_FIELD_WIDTH:] if material is not None else None
+        step_str = f"{step:>{STEP_FIELD_WIDTH}}"[-STEP_FIELD_WIDTH:] if step is not None else None
+
         # Use provided element IDs or fall back to selected elements
         elements_to_update = element_ids_to_update if element_ids_to_update is not None else self.selected_elements
 
-        for element_id in elements_to_update:
-            element = self.elements.get(element_id)
-            if not element:
-                continue
+        # Handle both single filter string and list of filter strings (an element matches any filter in the list)
+        filter_types = element_type_filter if isinstance(element_type_filter, list) else [element_type_filter]
+        element_matches_filter = self.element_matches_filter
 
-            # Handle both single filter string and list of filter strings
-            if isinstance(element_type_filter, list):
-                # Check if the element matches any filter in the list
-                matches_filter = False
-                for filter_type in element_type_filter:
-                    if self.element_matches_filter(element, filter_type):
-                        matches_filter = True
-                        break
+        # Pick the field splice once, so the loop body has no per-field branches
+        splice_fields = self._get_field_splicer(material_str, step_str)
 
-                if not matches_filter:
-                    continue
-            elif not self.element_matches_filter(element, element_type_filter):
+        for element in map(self.elements.get, elements_to_update):
+            if element is None:
+                continue
+
+            if not any(element_matches_filter(element, filter_type) for filter_type in filter_types):
                 continue
 
             # Update element in memory
@@ -709,43 +850,17 @@ class CandeModel:
 
             updated_count += 1
 
-            # Get the line to modify
-            line = self.file_content[element.line_number]
-
             # For CANDE input files, we need to preserve the exact format
             # The materials and steps are at positions defined by global constants
-
-            # Material field
-            if material is not None:
-                # Right-align within the field width
-                material_str = str(material).rjust(MATERIAL_FIELD_WIDTH)
-                # Make sure we have the right length field
-                if len(material_str) > MATERIAL_FIELD_WIDTH:
-                    material_str = material_str[-MATERIAL_FIELD_WIDTH:]  # Take only last chars if too long
-
-                # Get the parts before and after the field we're modifying
-                prefix = line[:MATERIAL_START_POS] if len(line) > MATERIAL_START_POS else line
-                # Make sure we don't go past the end of the line
-                suffix = line[MATERIAL_END_POS:] if len(line) > MATERIAL_END_POS else ""
-                line = prefix + material_str + suffix
-
-            # Step field
-            if step is not None:
-                # Right-align within the field width
-                step_str = str(step).rjust(STEP_FIELD_WIDTH)
-                # Make sure we have the right length field
-                if len(step_str) > STEP_FIELD_WIDTH:
-                    step_str = step_str[-STEP_FIELD_WIDTH:]  # Take only last chars if too long
-
-                # Get the parts before and after the field we're modifying
-                prefix = line[:STEP_START_POS] if len(line) > STEP_START_POS else line
-                # Make sure we don't go past the end of the line
-                suffix = line[STEP_END_POS:] if len(line) > STEP_END_POS else ""
-                line = prefix + step_str + suffix
+            line = splice_fields(self.file_content[element.line_number])
 
             # Update the line in the file
             self.file_content[element.line_number] = line
             element.line_content = line
+            self._dirty_elements.discard(element.element_id)
+
+        if updated_count:
+            self.mesh_index.refresh_materials()
 
         return updated_count
 
@@ -781,16 +896,14 @@ class CandeModel:
         # Find nodes shared between multiple beam elements and also connected to 2D elements
         shared_nodes = self._find_shared_beam_nodes()
 
-        # First pass: identify all nodes that could potentially be shared
-        all_shared_nodes = set()
-        for element_id, element in beam_elements.items():
-            for node_id in element.nodes:
-                all_shared_nodes.add(node_id)
+        # Count the beams using each node in a single pass (a beam listing a node twice counts once)
+        beam_node_counts = {}
+        for element in beam_elements.values():
+            for node_id in set(element.nodes):
+                beam_node_counts[node_id] = beam_node_counts.get(node_id, 0) + 1
 
         # Filter to only include nodes that are actually shared between beams
-        all_shared_nodes = {node_id for node_id in all_shared_nodes
-                            if sum(1 for element in beam_elements.values()
-                                   if node_id in element.nodes) > 1}
+        all_shared_nodes = {node_id for node_id, count in beam_node_counts.items() if count > 1}
 
         logger.info(f"Found {len(all_shared_nodes)} total shared nodes between beam elements")
         logger.info(f"Found {len(shared_nodes)} eligible shared nodes for interfaces")
@@ -920,6 +1033,9 @@ class CandeModel:
         # Assign proper material IDs to all interface elements
         self.assign_interface_material_ids()
 
+        # New nodes/elements were added and beam connectivity changed
+        self.rebuild_mesh_index()
+
         # At the end, return the count of created interfaces and False since some nodes were eligible
         return interface_count, False
 
@@ -1019,9 +1135,7 @@ class CandeModel:
                         original_line = self.file_content[element.line_number]
 
                         # Use regex to find the node IDs in the line
-                        pattern = re.compile(
-                            r'^\s*C-4\.L3!![ L]+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)(?:\s+(\d+))?')
-                        match = pattern.match(original_line)
+                        match = ELEMENT_PATTERN.match(original_line)
 
                         if match:
                             # Extract parts before and after the node IDs
@@ -1039,6 +1153,7 @@ class CandeModel:
 
                             # Update the line content in the element
                             element.line_content = updated_line
+                            self._dirty_elements.add(element_id)
 
         logger.info(f"Updated {updated_count} beam elements to use new node {new_node_id}")
         if updated_elements:
@@ -1341,7 +1456,6 @@ class CandeModel:
         if shared_node_id not in self.nodes:
             return None
         shared_node = self.nodes[shared_node_id]
-        shared_point = (shared_node.x, shared_node.y)
 
         # Get the two beam elements
         beam1 = beam_collection[element_ids[0]]
@@ -1360,57 +1474,7 @@ class CandeModel:
         if len(endpoints) != 2:
             return None
 
-        # Calculate the chord vector (from endpoint 0 to endpoint 1)
-        chord_vector = (endpoints[1][0] - endpoints[0][0],
-                        endpoints[1][1] - endpoints[0][1])
-
-        # Calculate the chord length
-        chord_length = math.sqrt(chord_vector[0] ** 2 + chord_vector[1] ** 2)
-
-        if chord_length < 1e-8:  # Avoid division by zero
-            return None
-
-        # Calculate the chord midpoint
-        chord_midpoint = ((endpoints[0][0] + endpoints[1][0]) / 2,
-                          (endpoints[0][1] + endpoints[1][1]) / 2)
-
-        # Vector from chord midpoint to shared node
-        vector_to_shared = (shared_point[0] - chord_midpoint[0],
-                            shared_point[1] - chord_midpoint[1])
-
-        # Normalize vector_to_shared
-        mag_vector_to_shared = math.sqrt(vector_to_shared[0] ** 2 + vector_to_shared[1] ** 2)
-
-        # Check for colinearity - if the shared point is too close to the chord
-        if mag_vector_to_shared < 1e-8:  # Colinear case
-            return None
-
-        # Normalize the vector
-        vector_to_shared = (vector_to_shared[0] / mag_vector_to_shared,
-                            vector_to_shared[1] / mag_vector_to_shared)
-
-        # Calculate two possible perpendicular vectors to the chord
-        perpendicular1 = (-chord_vector[1] / chord_length, chord_vector[0] / chord_length)  # 90° CCW
-        perpendicular2 = (chord_vector[1] / chord_length, -chord_vector[0] / chord_length)  # 90° CW
-
-        # Determine which perpendicular vector points toward the shared node
-        # by comparing dot products
-        dot1 = perpendicular1[0] * vector_to_shared[0] + perpendicular1[1] * vector_to_shared[1]
-        dot2 = perpendicular2[0] * vector_to_shared[0] + perpendicular2[1] * vector_to_shared[1]
-
-        # Select the perpendicular that has a positive dot product with the vector to shared point
-        chosen_perpendicular = perpendicular1 if dot1 > dot2 else perpendicular2
-
-        # Calculate the angle of this perpendicular vector from the horizontal
-        angle = math.degrees(math.atan2(chosen_perpendicular[1], chosen_perpendicular[0]))
-
-        # Normalize to 0-360 range
-        while angle < 0:
-            angle += 360.0
-        while angle >= 360.0:
-            angle -= 360.0
-
-        return angle
+        return self._calculate_perpendicular_angle(shared_node.x, shared_node.y, *endpoints[0], *endpoints[1])
 
     def _calculate_angle_with_extended_search(self, shared_node_id: int, element_ids: List[int],
                                               beam_collection: Dict[int, Element1D],
@@ -1520,55 +1584,54 @@ class CandeModel:
         end1_node = self.nodes[end1_id]
         end2_node = self.nodes[end2_id]
 
-        shared_point = (shared_node.x, shared_node.y)
-        endpoints = [(end1_node.x, end1_node.y), (end2_node.x, end2_node.y)]
+        return self._calculate_perpendicular_angle(shared_node.x, shared_node.y,
+                                                   end1_node.x, end1_node.y, end2_node.x, end2_node.y)
+
+    @staticmethod
+    def _calculate_perpendicular_angle(shared_x: float, shared_y: float, end1_x: float, end1_y: float,
+                                       end2_x: float, end2_y: float) -> Optional[float]:
+        """
+        Calculate the angle of the chord perpendicular that points from the chord toward the shared node.
 
-        # Calculate the chord vector (from endpoint 0 to endpoint 1)
-        chord_vector = (endpoints[1][0] - endpoints[0][0],
-                        endpoints[1][1] - endpoints[0][1])
+        Args:
+            shared_x: X coordinate of the shared node
+            shared_y: Y coordinate of the shared node
+            end1_x: X coordinate of the first endpoint
+            end1_y: Y coordinate of the first endpoint
+            end2_x: X coordinate of the second endpoint
+            end2_y: Y coordinate of the second endpoint
 
-        # Calculate the chord length
-        chord_length = math.sqrt(chord_vector[0] ** 2 + chord_vector[1] ** 2)
+        Returns:
+            Angle in degrees (0-360), or None if the endpoints coincide or the shared node is on the chord
+        """
+        # Chord vector (from endpoint 1 to endpoint 2) and its length
+        chord_x = end2_x - end1_x
+        chord_y = end2_y - end1_y
+        chord_length = math.hypot(chord_x, chord_y)
 
         if chord_length < 1e-8:  # Endpoints are at the same location
             return None
 
-        # Calculate the chord midpoint
-        chord_midpoint = ((endpoints[0][0] + endpoints[1][0]) / 2,
-                          (endpoints[0][1] + endpoints[1][1]) / 2)
-
         # Vector from chord midpoint to shared node
-        vector_to_shared = (shared_point[0] - chord_midpoint[0],
-                            shared_point[1] - chord_midpoint[1])
-
-        # Normalize vector_to_shared
-        mag_vector_to_shared = math.sqrt(vector_to_shared[0] ** 2 + vector_to_shared[1] ** 2)
+        to_shared_x = shared_x - (end1_x + end2_x) / 2
+        to_shared_y = shared_y - (end1_y + end2_y) / 2
+        mag_to_shared = math.hypot(to_shared_x, to_shared_y)
 
         # Check for colinearity - if the shared point is too close to the chord
-        if mag_vector_to_shared < 1e-8:  # Colinear case
+        if mag_to_shared < 1e-8:  # Colinear case
             return None
 
-        # Normalize the vector
-        vector_to_shared = (vector_to_shared[0] / mag_vector_to_shared,
-                            vector_to_shared[1] / mag_vector_to_shared)
-
-        # Calculate perpendicular vectors to the chord (90° CCW and CW)
-        perpendicular1 = (-chord_vector[1] / chord_length, chord_vector[0] / chord_length)
-        perpendicular2 = (chord_vector[1] / chord_length, -chord_vector[0] / chord_length)
-
-        # Choose the perpendicular that points toward the shared node
-        dot1 = perpendicular1[0] * vector_to_shared[0] + perpendicular1[1] * vector_to_shared[1]
-        dot2 = perpendicular2[0] * vector_to_shared[0] + perpendicular2[1] * vector_to_shared[1]
-        chosen_perpendicular = perpendicular1 if dot1 > dot2 else perpendicular2
-
-        # Calculate angle from horizontal
-        angle = math.degrees(math.atan2(chosen_perpendicular[1], chosen_perpendicular[0]))
+        # Pick the chord perpendicular (90° CCW or CW) on the same side as the shared node,
+        # which is the sign of the chord x to-shared cross product
+        if chord_x * to_shared_y - chord_y * to_shared_x > 0:
+            angle = math.degrees(math.atan2(chord_x, -chord_y))
+        else:
+            angle = math.degrees(math.atan2(-chord_x, chord_y))
 
-        # Normalize to 0-360 range
-        while angle < 0:
-            angle += 360.0
-        while angle >= 360.0:
-            angle -= 360.0
+        # Normalize to 0-360 range (tiny negative angles round up to 360.0 in the modulo)
+        angle %= 360.0
+        if angle >= 360.0:
+            angle = 0.0
 
         return angle
 
@@ -1692,13 +1755,12 @@ class CandeModel:
         node_coords = []
         node_ids = []
         for node_id in element.nodes:
-            if node_id in self.nodes:
-                node = self.nodes[node_id]
-                node_coords.append((node.x, node.y))
-                node_ids.append(node_id)
-            else:
+            node = self.nodes.get(node_id)
+            if node is None:
                 logger.warning(f"Missing node {node_id} for element {element.element_id}")
                 return False
+            node_coords.append((node.x, node.y))
+            node_ids.append(node_id)
 
         # For triangles (3 nodes)
         if len(node_coords) == 3:
@@ -1706,17 +1768,18 @@ class CandeModel:
             (x1, y1), (x2, y2), (x3, y3) = node_coords
             signed_area = 0.5 * ((x2 - x1) * (y3 - y1) - (x3 - x1) * (y2 - y1))
 
-            # If area is negative, reverse node order to make it CCW
+            # If area is negative, reverse node order to make it CCW (in place, the list is the element's own)
             if signed_area < 0:
-                element.nodes = list(reversed(element.nodes))
+                element.nodes.reverse()
                 logger.info(f"Reordered triangle nodes for element {element.element_id} to ensure CCW orientation")
             return True
 
         # For quadrilaterals (4 nodes)
         elif len(node_coords) == 4:
             # Find the centroid
-            centroid_x = sum(x for x, _ in node_coords) / 4
-            centroid_y = sum(y for _, y in node_coords) / 4
+            (x1, y1), (x2, y2), (x3, y3), (x4, y4) = node_coords
+            centroid_x = (x1 + x2 + x3 + x4) / 4
+            centroid_y = (y1 + y2 + y3 + y4) / 4
 
             # Calculate angles from centroid to each node
             angles = []
@@ -1759,12 +1822,20 @@ class CandeModel:
 
     def _lines_intersect(self, p1, p2, p3, p4):
         """Check if line segment p1-p2 intersects with line segment p3-p4."""
+        # Segments whose bounding boxes don't overlap can't intersect (for mesh quads this
+        # rejects most opposite edge pairs, so the orientation tests are rarely needed)
+        x1, y1 = p1
+        x2, y2 = p2
+        x3, y3 = p3
+        x4, y4 = p4
+        if ((x1 < x3 and x1 < x4 and x2 < x3 and x2 < x4) or (x1 > x3 and x1 > x4 and x2 > x3 and x2 > x4)
+                or (y1 < y3 and y1 < y4 and y2 < y3 and y2 < y4) or (y1 > y3 and y1 > y4 and y2 > y3 and y2 > y4)):
+            return False
 
-        # Implementation of line segment intersection test
-        def ccw(a, b, c):
-            return (c[1] - a[1]) * (b[0] - a[0]) > (b[1] - a[1]) * (c[0] - a[0])
-
-        return ccw(p1, p3, p4) != ccw(p2, p3, p4) and ccw(p1, p2, p3) != ccw(p1, p2, p4)
+        # Segments intersect when each one's endpoints lie on different sides of the other
+        # (counter-clockwise orientation tests, written out on the unpacked coordinates)
+        return (((y4 - y1) * (x3 - x1) > (y3 - y1) * (x4 - x1)) != ((y4 - y2) * (x3 - x2) > (y3 - y2) * (x4 - x2))
+                and ((y3 - y1) * (x2 - x1) > (y2 - y1) * (x3 - x1)) != ((y4 - y1) * (x2 - x1) > (y2 - y1) * (x4 - x1)))
 
     def assign_interface_material_ids(self):
         """
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from typing import List
 
 
-@dataclass
+@dataclass(slots=True)
 class BaseElement:
     """Base class for CANDE elements."""
     element_id: int
@@ -30,35 +30,36 @@ class BaseElement:
             raise ValueError("Step number must be a positive integer")
 
 
-@dataclass
+@dataclass(slots=True)
 class Element(BaseElement):
     """Represents an element in the CANDE model."""
     node_count: int  # 2 for beams, 3 for triangles, 4 for quads
 
     def __post_init__(self):
         """Validate element data after initialization."""
-        super().__post_init__()
+        # Explicit form: slots dataclasses are recreated, which breaks the zero-argument super()
+        super(Element, self).__post_init__()
         if not isinstance(self.node_count, int) or self.node_count < 2 or self.node_count > 4:
             raise ValueError("Node count must be between 2 and 4")
         if len(self.nodes) != self.node_count:
             raise ValueError(f"Expected {self.node_count} nodes, got {len(self.nodes)}")
 
 
-@dataclass
+@dataclass(slots=True)
 class Element1D(BaseElement):
     """Represents a 1D element in the CANDE model."""
     # Add any 2D-specific attributes here as needed
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Element2D(BaseElement):
     """Represents a 2D element in the CANDE model."""
     # Add any 2D-specific attributes here as needed
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class InterfaceElement(BaseElement):
     """Represents a 0D interface element in the CANDE model."""
     # Any interface-specific properties would go here
@@ -66,11 +67,10 @@ class InterfaceElement(BaseElement):
     angle: float = 0.0  # Angle from horizontal of normal-force direction (in degrees)
 
     def __post_init__(self):
-        super().__post_init__()
+        super(InterfaceElement, self).__post_init__()
         if len(self.nodes) != 3:
             raise ValueError("Interface elements must consist of 3 nodes")
-        # Ensure angle is in the valid range
-        while self.angle < 0:
-            self.angle += 360.0
-        while self.angle >= 360.0:
-            self.angle -= 360.0
+        # Ensure angle is in the valid range (tiny negative angles round up to 360.0 in the modulo)
+        self.angle %= 360.0
+        if self.angle >= 360.0:
+            self.angle = 0.0
@@ -0,0 +1,245 @@
+"""
+Flat geometry index for CANDE Input File Editor.
+Stores node coordinates and element connectivity as parallel lists (struct-of-arrays)
+so rendering and hit-testing can work on dense indices instead of per-object lookups,
+plus a uniform grid over the element bounding boxes for spatial queries.
+"""
+import math
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from models.node import Node
+from models.element import BaseElement, Element1D, Element2D, InterfaceElement
+from utils.constants import CANDE_COLORS
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class MeshIndex:
+    """Dense, index-based view of the nodes and elements of a CANDE model."""
+
+    def __init__(self, nodes: Dict[int, Node], elements: Dict[int, BaseElement]) -> None:
+        """
+        Build the index from the model dictionaries.
+
+        Args:
+            nodes: Dictionary of nodes
+            elements: Dictionary of elements
+        """
+        # Node arrays (row i describes node node_ids[i])
+        self.node_ids: List[int] = list(nodes)
+        self.node_index: Dict[int, int] = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.node_x: List[float] = [node.x for node in nodes.values()]
+        self.node_y: List[float] = [node.y for node in nodes.values()]
+
+        # Element arrays (row i describes element element_ids[i])
+        self.element_ids: List[int] = list(elements)
+        self.element_index: Dict[int, int] = {element_id: i for i, element_id in enumerate(self.element_ids)}
+        self.elements: List[BaseElement] = list(elements.values())
+
+        # Node rows of each element, in element node order, resolved once here so later
+        # passes never look up node IDs (missing nodes are skipped)
+        self.element_node_indices: List[Tuple[int, ...]] = []
+        get_node_row = self.node_index.get
+        missing_count = 0
+        for element in self.elements:
+            rows = [get_node_row(node_id) for node_id in element.nodes]
+            if None in rows:
+                missing_count += rows.count(None)
+                rows = [row for row in rows if row is not None]
+            self.element_node_indices.append(tuple(rows))
+
+        if missing_count:
+            logger.warning(f"{missing_count} element node references point to missing nodes")
+
+        # Element type filter name of each element ("1D", "2D", "Interface"), and the display masks built from them
+        self.element_types: List[Optional[str]] = [self._get_element_type(element) for element in self.elements]
+        self._filter_masks: Dict[Tuple, List[bool]] = {}
+
+        self.refresh_materials()
+        self._build_bounding_boxes()
+        self._build_grid()
+
+    @staticmethod
+    def _get_element_type(element: BaseElement) -> Optional[str]:
+        """
+        Get the element type filter name matching an element.
+
+        Args:
+            element: The element to classify
+
+        Returns:
+            "1D", "2D", "Interface", or None for other elements
+        """
+        if isinstance(element, Element1D):
+            return "1D"
+        if isinstance(element, Element2D):
+            return "2D"
+        if isinstance(element, InterfaceElement):
+            return "Interface"
+        return None
+
+    def filter_mask(self, element_type_filter: Union[None, str, Sequence[Optional[str]]]) -> List[bool]:
+        """
+        Get which elements match an element type filter, computed once per filter.
+
+        Args:
+            element_type_filter: None (match all), a filter name, or a list of filter names
+                (an element matches any name in the list, an empty list matches nothing)
+
+        Returns:
+            List of flags aligned with the element rows
+        """
+        if element_type_filter is None or isinstance(element_type_filter, str):
+            filter_types = (element_type_filter,)
+        else:
+            filter_types = tuple(element_type_filter)
+
+        mask = self._filter_masks.get(filter_types)
+        if mask is None:
+            if None in filter_types:
+                mask = [True] * len(self.elements)
+            else:
+                wanted = set(filter_types)
+                mask = [element_type in wanted for element_type in self.element_types]
+            self._filter_masks[filter_types] = mask
+        return mask
+
+    def refresh_materials(self) -> None:
+        """Recompute the material/step arrays and palette indices of every element (after material/step edits)."""
+        color_count = len(CANDE_COLORS)
+        self.element_materials: List[int] = [element.material for element in self.elements]
+        self.element_steps: List[int] = [element.step for element in self.elements]
+        self.material_color_index: List[int] = [(material - 1) % color_count for material in self.element_materials]
+        self.step_color_index: List[int] = [(step - 1) % color_count for step in self.element_steps]
+
+    def _build_bounding_boxes(self) -> None:
+        """Compute the model-space bounding box of every element."""
+        node_x = self.node_x
+        node_y = self.node_y
+        self.element_min_x: List[float] = []
+        self.element_min_y: List[float] = []
+        self.element_max_x: List[float] = []
+        self.element_max_y: List[float] = []
+
+        for node_rows in self.element_node_indices:
+            if node_rows:
+                xs = [node_x[row] for row in node_rows]
+                ys = [node_y[row] for row in node_rows]
+                bounds = (min(xs), min(ys), max(xs), max(ys))
+            else:
+                # Elements without any known node can never be hit
+                bounds = (math.inf, math.inf, -math.inf, -math.inf)
+            self.element_min_x.append(bounds[0])
+            self.element_min_y.append(bounds[1])
+            self.element_max_x.append(bounds[2])
+            self.element_max_y.append(bounds[3])
+
+    def _build_grid(self) -> None:
+        """Bucket the element rows into a uniform grid keyed by cell coordinates."""
+        self.grid: Dict[Tuple[int, int], List[int]] = {}
+
+        rows = [row for row, node_rows in enumerate(self.element_node_indices) if node_rows]
+        if not rows:
+            self.cell_size = 1.0
+            self._grid_bounds = (0, 0, -1, -1)
+            return
+
+        # Extents of all element boxes (elements without nodes hold infinite bounds that never win)
+        model_bounds = (min(self.element_min_x), min(self.element_min_y),
+                        max(self.element_max_x), max(self.element_max_y))
+
+        # Cell size is the median element extent, so a typical element spans one or two cells
+        extents = sorted(
+            max(self.element_max_x[row] - self.element_min_x[row],
+                self.element_max_y[row] - self.element_min_y[row])
+            for row in rows
+        )
+        cell_size = extents[len(extents) // 2]
+        if cell_size <= 0:
+            # Degenerate elements (e.g. only interfaces): spread the model extents over the grid
+            width = model_bounds[2] - model_bounds[0]
+            height = model_bounds[3] - model_bounds[1]
+            cell_size = max(width, height) / max(1.0, math.sqrt(len(rows)))
+        self.cell_size = cell_size if cell_size > 0 else 1.0
+
+        grid = self.grid
+        for row in rows:
+            min_cx, min_cy, max_cx, max_cy = self._cell_range(
+                self.element_min_x[row], self.element_min_y[row],
+                self.element_max_x[row], self.element_max_y[row]
+            )
+            for cx in range(min_cx, max_cx + 1):
+                for cy in range(min_cy, max_cy + 1):
+                    grid.setdefault((cx, cy), []).append(row)
+
+        # Flooring is monotonic, so the cells of the overall box bound every occupied cell
+        self._grid_bounds = self._cell_range(*model_bounds)
+
+    def _cell_range(self, min_x: float, min_y: float,
+                    max_x: float, max_y: float) -> Tuple[int, int, int, int]:
+        """
+        Get the inclusive range of grid cells covered by a model-space box.
+
+        Returns:
+            Tuple of (min_cx, min_cy, max_cx, max_cy)
+        """
+        cell_size = self.cell_size
+        return (math.floor(min_x / cell_size), math.floor(min_y / cell_size),
+                math.floor(max_x / cell_size), math.floor(max_y / cell_size))
+
+    def query_box(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[int]:
+        """
+        Find the element rows whose bounding box overlaps a model-space box.
+
+        Args:
+            min_x: Minimum X coordinate of the box
+            min_y: Minimum Y coordinate of the box
+            max_x: Maximum X coordinate of the box
+            max_y: Maximum Y coordinate of the box
+
+        Returns:
+            Sorted list of candidate element rows (element order is preserved)
+        """
+        grid_min_cx, grid_min_cy, grid_max_cx, grid_max_cy = self._grid_bounds
+        min_cx, min_cy, max_cx, max_cy = self._cell_range(min_x, min_y, max_x, max_y)
+
+        # Only visit cells that can actually contain elements
+        min_cx = max(min_cx, grid_min_cx)
+        min_cy = max(min_cy, grid_min_cy)
+        max_cx = min(max_cx, grid_max_cx)
+        max_cy = min(max_cy, grid_max_cy)
+
+        candidates = set()
+        grid = self.grid
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                cell = grid.get((cx, cy))
+                if cell:
+                    candidates.update(cell)
+
+        # Exact bounding box overlap test on the (few) candidates
+        element_min_x = self.element_min_x
+        element_min_y = self.element_min_y
+        element_max_x = self.element_max_x
+        element_max_y = self.element_max_y
+        return sorted(
+            row for row in candidates
+            if element_min_x[row] <= max_x and element_max_x[row] >= min_x
+            and element_min_y[row] <= max_y and element_max_y[row] >= min_y
+        )
+
+    def query_point(self, x: float, y: float, tolerance: float = 0.0) -> List[int]:
+        """
+        Find the element rows whose bounding box (grown by a tolerance) contains a point.
+
+        Args:
+            x: Model X coordinate
+            y: Model Y coordinate
+            tolerance: Distance in model units to grow each bounding box by
+
+        Returns:
+            Sorted list of candidate element rows (element order is preserved)
+        """
+        return self.query_box(x - tolerance, y - tolerance, x + tolerance, y + tolerance)
@@ -4,7 +4,7 @@ Node model for CANDE Input File Editor.
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Node:
     """Represents a node in the CANDE model."""
     node_id: int
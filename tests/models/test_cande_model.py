@@ -0,0 +1,177 @@
+import locale
+
+import pytest
+
+from models.cande_model import (
+    CandeModel, NODE_PATTERN, ELEMENT_PATTERN, NODE_LINE_PREFIX, ELEMENT_LINE_PREFIX,
+    _parse_node_line, _parse_element_line
+)
+from utils.constants import FILE_BUFFER_SIZE
+
+
+NODE_LINES = [
+    "                   C-3.L3!!    1  000     0.000     0.000",
+    "                   C-3.L3!!    2  000    10.000     0.000",
+    "                   C-3.L3!!    3  000    10.000    10.000",
+    "                   C-3.L3!!    4  000     0.000    10.000",
+    "                   C-3.L3!!    5  000    20.000     0.000",
+    "                   C-3.L3!!L   6  000    20.000    10.000",
+]
+
+ELEMENT_LINES = [
+    "                   C-4.L3!!    1    1    2    3    4    1    1    0",
+    "                   C-4.L3!!    2    2    5    6    3    2    1    0",
+    "                   C-4.L3!!    3    4    3    0    0    3    1    0",
+    "                   C-4.L3!!L   4    3    6    0    0    3    1    0",
+]
+
+
+# Four quads in a row with a beam along each (bent) top edge, so the beam joints at
+# nodes 7, 8 and 9 give interfaces at different angles
+STRIP_FILE = """\
+                   A-1!!ANALYS  2 PLAIN     Strip
+                 C-1.L3!!  Strip mesh
+                 C-2.L3!!    3    1    0    0    0   10    8    0    2    0
+                   C-3.L3!!    1  000     0.000     0.000
+                   C-3.L3!!    2  000    10.000     0.000
+                   C-3.L3!!    3  000    20.000     0.000
+                   C-3.L3!!    4  000    30.000     0.000
+                   C-3.L3!!    5  000    40.000     0.000
+                   C-3.L3!!    6  000     0.000    10.000
+                   C-3.L3!!    7  000    10.000    10.000
+                   C-3.L3!!    8  000    20.000    12.000
+                   C-3.L3!!    9  000    30.000    11.000
+                   C-3.L3!!L  10  000    40.000    10.000
+                   C-4.L3!!    1    1    2    7    6    1    1    0
+                   C-4.L3!!    2    2    3    8    7    1    1    0
+                   C-4.L3!!    3    3    4    9    8    1    1    0
+                   C-4.L3!!    4    4    5   10    9    1    1    0
+                   C-4.L3!!    5    6    7    0    0    2    1    0
+                   C-4.L3!!    6    7    8    0    0    2    1    0
+                   C-4.L3!!    7    8    9    0    0    2    1    0
+                   C-4.L3!!L   8    9   10    0    0    2    1    0
+                   C-5.L3!!L    1    1    0    0
+                      D-1!!L   1    1   0  Soil 1
+                     STOP
+"""
+
+
+@pytest.fixture
+def strip_model(tmp_path):
+    """Model loaded from the strip mesh file."""
+    path = tmp_path / "strip.cid"
+    path.write_text(STRIP_FILE)
+    model = CandeModel()
+    assert model.load_file(str(path))
+    return model
+
+
+def regex_node_values(line):
+    """Node values as parsed by the regex fallback path."""
+    match = NODE_PATTERN.match(line)
+    if not match:
+        return None
+    return int(match.group(1)), float(match.group(2)), float(match.group(3))
+
+
+def regex_element_values(line):
+    """Element values as parsed by the regex fallback path."""
+    match = ELEMENT_PATTERN.match(line)
+    if not match:
+        return None
+    return tuple(int(group) if group else 0 for group in match.groups())
+
+
+class TestLineParsers:
+    """The regex-free line parsers against the regex fallback path."""
+
+    @pytest.mark.parametrize("line", NODE_LINES)
+    def test_node_line_matches_regex(self, line):
+        assert _parse_node_line(line) == regex_node_values(line)
+
+    @pytest.mark.parametrize("line", ELEMENT_LINES)
+    def test_element_line_matches_regex(self, line):
+        assert _parse_element_line(line) == regex_element_values(line)
+
+    @pytest.mark.parametrize("line", NODE_LINES)
+    def test_truncated_node_lines(self, line):
+        # Every prefix of a line either parses like the regex or is left to the regex path
+        for end in range(len(line) + 1):
+            values = _parse_node_line(line[:end])
+            assert values is None or values == regex_node_values(line[:end])
+
+    @pytest.mark.parametrize("line", ELEMENT_LINES)
+    def test_truncated_element_lines(self, line):
+        for end in range(len(line) + 1):
+            values = _parse_element_line(line[:end])
+            assert values is None or values == regex_element_values(line[:end])
+
+    @pytest.mark.parametrize("line", ["", "C-3.L3!!", NODE_LINE_PREFIX, NODE_LINE_PREFIX + "\n"])
+    def test_short_node_lines(self, line):
+        assert _parse_node_line(line) is None
+
+    @pytest.mark.parametrize("line", ["", "C-4.L3!!", ELEMENT_LINE_PREFIX, ELEMENT_LINE_PREFIX + "\n"])
+    def test_short_element_lines(self, line):
+        assert _parse_element_line(line) is None
+
+    def test_load_file_ending_in_bare_marker(self, tmp_path):
+        path = tmp_path / "bare_marker.cid"
+        path.write_text("\n".join(NODE_LINES + ELEMENT_LINES + [ELEMENT_LINE_PREFIX]))
+
+        model = CandeModel()
+        assert model.load_file(str(path))
+        assert len(model.nodes) == len(NODE_LINES)
+        assert len(model.elements) == len(ELEMENT_LINES)
+
+
+class TestSelectionAfterSave:
+    """Selections read the mesh index, which has to follow material changes made while saving."""
+
+    def test_select_by_material_after_save(self, strip_model, tmp_path):
+        strip_model.create_interfaces({5, 6, 7}, friction=0.4)
+        strip_model.create_interfaces({7, 8}, friction=0.25)
+        materials_before_save = {element_id: element.material for element_id, element in strip_model.elements.items()}
+        assert strip_model.save_file(str(tmp_path / "saved.cid"))
+
+        # Saving renumbers the interface materials
+        assert materials_before_save != {element_id: element.material
+                                         for element_id, element in strip_model.elements.items()}
+
+        materials = {element.material for element in strip_model.elements.values()}
+        for material in range(1, max(materials) + 2):
+            strip_model.selected_elements.clear()
+            count = strip_model.select_elements_by_material(material)
+            expected = {element_id for element_id, element in strip_model.elements.items()
+                        if element.material == material}
+            assert strip_model.selected_elements == expected
+            assert count == len(expected)
+
+
+class TestFailedLoad:
+    """A load that fails while reading must leave the previously loaded model untouched."""
+
+    def test_read_error_keeps_previous_model(self, strip_model, tmp_path):
+        undecodable = b"\xff"
+        try:
+            undecodable.decode(locale.getpreferredencoding(False))
+            pytest.skip("the default encoding decodes every byte")
+        except UnicodeDecodeError:
+            pass
+
+        # Valid lines filling more than one read buffer, then a byte the text decoder rejects
+        node_line = NODE_LINES[0].encode() + b"\n"
+        path = tmp_path / "broken.cid"
+        path.write_bytes(node_line * (FILE_BUFFER_SIZE // len(node_line) + 100) + undecodable + b"\n")
+
+        nodes = dict(strip_model.nodes)
+        elements = dict(strip_model.elements)
+        file_content = list(strip_model.file_content)
+        filepath = strip_model.filepath
+        mesh_index = strip_model.mesh_index
+
+        assert not strip_model.load_file(str(path))
+        assert strip_model.nodes == nodes
+        assert strip_model.elements == elements
+        assert strip_model.file_content == file_content
+        assert strip_model.filepath == filepath
+        assert strip_model.mesh_index is mesh_index
@@ -0,0 +1,166 @@
+import random
+
+import pytest
+
+from models.cande_model import CandeModel
+from models.element import Element1D, Element2D, InterfaceElement
+from models.mesh_index import MeshIndex
+from models.node import Node
+from utils.constants import CANDE_COLORS
+
+
+def make_node(node_id, x, y):
+    return Node(node_id=node_id, x=x, y=y, line_number=-1, line_content="")
+
+
+def make_element(element_type, element_id, nodes, material=1, step=1):
+    return element_type(element_id=element_id, nodes=nodes, material=material, step=step,
+                        line_number=-1, line_content="")
+
+
+@pytest.fixture
+def random_mesh():
+    """Nodes and a mix of beam, triangle, quad and interface elements at random positions."""
+    rnd = random.Random(42)
+    nodes = {node_id: make_node(node_id, rnd.uniform(-50, 50), rnd.uniform(-20, 80)) for node_id in range(1, 201)}
+    elements = {}
+    for element_id in range(1, 301):
+        node_ids = rnd.sample(range(1, 201), 4)
+        kind = rnd.randrange(4)
+        if kind == 0:
+            elements[element_id] = make_element(Element1D, element_id, node_ids[:2], material=rnd.randint(1, 5))
+        elif kind == 1:
+            elements[element_id] = make_element(Element2D, element_id, node_ids[:3], material=rnd.randint(1, 5))
+        elif kind == 2:
+            elements[element_id] = make_element(Element2D, element_id, node_ids, material=rnd.randint(1, 5))
+        else:
+            # Interfaces sit on a single location (both nodes coincide)
+            elements[element_id] = make_element(InterfaceElement, element_id,
+                                                [node_ids[0], node_ids[0], node_ids[1]])
+    return nodes, elements
+
+
+def brute_force_box(nodes, elements, min_x, min_y, max_x, max_y):
+    """Element IDs whose node bounding box overlaps the box, by scanning every element."""
+    hits = []
+    for element_id, element in elements.items():
+        xs = [nodes[node_id].x for node_id in element.nodes]
+        ys = [nodes[node_id].y for node_id in element.nodes]
+        if min(xs) <= max_x and max(xs) >= min_x and min(ys) <= max_y and max(ys) >= min_y:
+            hits.append(element_id)
+    return hits
+
+
+class TestSpatialQueries:
+    """Grid queries against a brute-force bounding box scan."""
+
+    def test_query_box_matches_brute_force(self, random_mesh):
+        nodes, elements = random_mesh
+        mesh_index = MeshIndex(nodes, elements)
+        rnd = random.Random(7)
+        for _ in range(200):
+            xs = sorted(rnd.uniform(-70, 70) for _ in range(2))
+            ys = sorted(rnd.uniform(-40, 100) for _ in range(2))
+            rows = mesh_index.query_box(xs[0], ys[0], xs[1], ys[1])
+            assert rows == sorted(rows)
+            assert [mesh_index.element_ids[row] for row in rows] == \
+                brute_force_box(nodes, elements, xs[0], ys[0], xs[1], ys[1])
+
+    def test_query_point_matches_brute_force(self, random_mesh):
+        nodes, elements = random_mesh
+        mesh_index = MeshIndex(nodes, elements)
+        rnd = random.Random(11)
+        for _ in range(200):
+            x, y = rnd.uniform(-60, 60), rnd.uniform(-30, 90)
+            tolerance = rnd.choice([0.0, 0.5, 5.0])
+            rows = mesh_index.query_point(x, y, tolerance)
+            assert [mesh_index.element_ids[row] for row in rows] == \
+                brute_force_box(nodes, elements, x - tolerance, y - tolerance, x + tolerance, y + tolerance)
+
+    def test_query_outside_model(self, random_mesh):
+        mesh_index = MeshIndex(*random_mesh)
+        assert mesh_index.query_box(1000, 1000, 2000, 2000) == []
+        assert mesh_index.query_point(-1000, -1000, 1.0) == []
+
+    def test_elements_with_missing_nodes_are_never_hit(self):
+        nodes = {1: make_node(1, 0, 0), 2: make_node(2, 10, 0)}
+        elements = {1: make_element(Element1D, 1, [1, 2]), 2: make_element(Element1D, 2, [3, 4])}
+        mesh_index = MeshIndex(nodes, elements)
+        assert mesh_index.query_box(-100, -100, 100, 100) == [0]
+
+    def test_empty_mesh(self):
+        mesh_index = MeshIndex({}, {})
+        assert mesh_index.query_box(-1, -1, 1, 1) == []
+
+
+class TestFilterMask:
+    """Element type masks and their cache."""
+
+    def test_masks_match_element_types(self, random_mesh):
+        nodes, elements = random_mesh
+        mesh_index = MeshIndex(nodes, elements)
+        types = {"1D": Element1D, "2D": Element2D, "Interface": InterfaceElement}
+        for name, element_type in types.items():
+            assert mesh_index.filter_mask(name) == [isinstance(element, element_type)
+                                                    for element in elements.values()]
+        assert mesh_index.filter_mask(["1D", "Interface"]) == [
+            isinstance(element, (Element1D, InterfaceElement)) for element in elements.values()
+        ]
+        assert mesh_index.filter_mask(None) == [True] * len(elements)
+        assert mesh_index.filter_mask([]) == [False] * len(elements)
+
+    def test_cached_masks_are_per_filter(self, random_mesh):
+        mesh_index = MeshIndex(*random_mesh)
+        beams = mesh_index.filter_mask("1D")
+        assert mesh_index.filter_mask(["1D"]) is beams
+        assert mesh_index.filter_mask("2D") != beams
+
+    def test_rebuilt_index_masks_include_new_elements(self):
+        model = CandeModel()
+        model.nodes.update({1: make_node(1, 0, 0), 2: make_node(2, 10, 0), 3: make_node(3, 10, 10)})
+        model.elements[1] = make_element(Element2D, 1, [1, 2, 3])
+        model.rebuild_mesh_index()
+        assert model.mesh_index.filter_mask("Interface") == [False]
+
+        model.elements[2] = make_element(InterfaceElement, 2, [2, 2, 3])
+        model.rebuild_mesh_index()
+        assert model.mesh_index.filter_mask("Interface") == [False, True]
+        assert model.mesh_index.filter_mask("2D") == [True, False]
+
+
+class TestRefreshMaterials:
+    """Material/step arrays follow element edits."""
+
+    def test_refresh_tracks_element_changes(self, random_mesh):
+        nodes, elements = random_mesh
+        mesh_index = MeshIndex(nodes, elements)
+        for element in list(elements.values())[::3]:
+            element.material += 7
+            element.step += 2
+        mesh_index.refresh_materials()
+
+        assert mesh_index.element_materials == [element.material for element in elements.values()]
+        assert mesh_index.element_steps == [element.step for element in elements.values()]
+        assert mesh_index.material_color_index == [(element.material - 1) % len(CANDE_COLORS)
+                                                   for element in elements.values()]
+        assert mesh_index.step_color_index == [(element.step - 1) % len(CANDE_COLORS)
+                                               for element in elements.values()]
+
+    def test_update_elements_refreshes_index(self, tmp_path):
+        lines = [
+            "                   C-3.L3!!    1  000     0.000     0.000",
+            "                   C-3.L3!!    2  000    10.000     0.000",
+            "                   C-3.L3!!L   3  000    10.000    10.000",
+            "                   C-4.L3!!    1    1    2    3    0    1    1    0",
+            "                   C-4.L3!!L   2    1    2    0    0    2    1    0",
+        ]
+        path = tmp_path / "mesh.cid"
+        path.write_text("\n".join(lines) + "\n")
+        model = CandeModel()
+        assert model.load_file(str(path))
+
+        assert model.update_elements(material=5, step=3, element_ids_to_update=[1]) == 1
+        assert model.mesh_index.element_materials == [5, 2]
+        assert model.mesh_index.element_steps == [3, 1]
+        assert model.select_elements_by_material(5) == 1
+        assert model.selected_elements == {1}
@@ -11,9 +11,15 @@ STEP_START_POS = 57      # Step field starts at position 58 (1-based) -> 57 (0-b
 STEP_END_POS = 62        # Step field ends at position 62 (1-based) -> 62 (0-based)
 STEP_FIELD_WIDTH = STEP_END_POS - STEP_START_POS
 
+# File reading
+FILE_BUFFER_SIZE = 1 << 20  # 1 MiB read buffer for streaming input files
+
 # Width for line elements (1D elements)
 LINE_ELEMENT_WIDTH = 3  # Default width for line elements
 
+# Pick radius for interface element markers
+INTERFACE_PICK_RADIUS = 10  # Pixels from the marker center
+
 # CANDE colors for element rendering
 CANDE_COLORS = [
     "#FF0000",  # 1 Red
@@ -49,5 +55,10 @@ NORMAL_ELEMENT_COLOR = "black"
 SELECTED_ELEMENT_WIDTH = 2
 NORMAL_ELEMENT_WIDTH = 1
 CANVAS_PADDING = 0.05  # 5% padding for zoom to fit
+CULL_MARGIN = 0.5  # Canvas sizes drawn beyond each visible edge so panning can reuse the mesh layer
+RENDER_CHUNK_SIZE = 5000  # Elements drawn per idle callback when building a large mesh layer
 CLICK_THRESHOLD = 5  # Pixels to distinguish click from drag
 ZOOM_FACTOR = 1.1  # Zoom in/out factor per mouse wheel tick
+PAN_REDRAW_THRESHOLD = 1  # Pixels of pan movement ignored before redrawing
+LASSO_POLL_INTERVAL = 10  # Milliseconds between checks for a finished lasso selection
+MOTION_UPDATE_INTERVAL = 16  # Milliseconds between selection box / coordinate updates while the mouse moves
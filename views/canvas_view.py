@@ -2,19 +2,59 @@
 Canvas view for CANDE Input File Editor.
 """
 import tkinter as tk
-from typing import Dict, List, Set, Tuple, Any, Optional
+from typing import Dict, Iterable, List, Sequence, Set, Tuple, Any, Optional, Union
 from enum import Enum, auto
 import logging
 import math
 
 from models.node import Node
 from models.element import BaseElement, Element, Element1D, Element2D, InterfaceElement
-from utils.constants import CANDE_COLORS, LINE_ELEMENT_WIDTH
+from models.mesh_index import MeshIndex
+from utils.constants import (
+    CANDE_COLORS, LINE_ELEMENT_WIDTH, INTERFACE_PICK_RADIUS, CULL_MARGIN, RENDER_CHUNK_SIZE
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
+def point_in_polygon_rows(x: float, y: float, rows: Sequence[int],
+                          xs: Sequence[float], ys: Sequence[float]) -> bool:
+    """
+    Check if a point is inside a polygon using ray casting algorithm.
+
+    The polygon vertices are given as rows into flat coordinate arrays, so callers
+    working on the mesh index don't need to build a list of points first.
+
+    Args:
+        x: X coordinate of the point
+        y: Y coordinate of the point
+        rows: Indices of the polygon vertices in xs/ys, in order
+        xs: X coordinates
+        ys: Y coordinates
+
+    Returns:
+        True if the point is inside the polygon, False otherwise
+    """
+    inside = False
+
+    # Start from the last vertex so the closing edge comes first and no index wraps around
+    row = rows[-1]
+    p1x = xs[row]
+    p1y = ys[row]
+    for row in rows:
+        p2x = xs[row]
+        p2y = ys[row]
+        # The edge straddles the ray (min < y <= max, so it is never horizontal) and
+        # crosses it at or to the right of the point
+        if (p1y < y) != (p2y < y) and (x <= p1x or x <= p2x):
+            if x <= (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x:
+                inside = not inside
+        p1x, p1y = p2x, p2y
+
+    return inside
+
+
 class DisplayMode(Enum):
     """Display mode for coloring elements."""
     MATERIAL = auto()
@@ -46,11 +86,43 @@ class CanvasView:
         self.locked_cursor_x = 0
         self.locked_cursor_y = 0
 
+        # Base mesh layer cache: the layer is only rebuilt when this key changes
+        self._mesh_key: Optional[Tuple] = None
+        self._mesh_dirty = True
+
+        # Zoom, pan offset and display mode the current layers were drawn at, and the element IDs drawn as selected
+        self._layer_zoom = self.zoom_level
+        self._layer_pan: Tuple[float, float] = (0, 0)
+        self._layer_display_mode = self.display_mode
+        self._drawn_selection: Set[int] = set()
+
+        # Model-space region (min_x, min_y, max_x, max_y) the mesh layer was drawn for
+        self._layer_region: Optional[Tuple[float, float, float, float]] = None
+
+        # Element IDs whose material/step changed and whose drawn items must be recolored
+        self._recolor_elements: Set[int] = set()
+
+        # Rows of the mesh layer still to be drawn in idle-time chunks, and the after_idle id drawing the next one
+        self._pending_rows: Optional[Tuple] = None
+        self._pending_rows_id = None
+
+        # Projected node coordinates, reused until the mesh index or view transform changes
+        self._projection_key: Optional[Tuple] = None
+        self._projection: Tuple[List[float], List[float]] = ([], [])
+
     def render_mesh(self, nodes, elements, selected_elements, max_material=1, max_step=1,
-                    element_type_filter=None, line_width=3) -> None:
+                    element_type_filter=None, line_width=3, mesh_index: Optional[MeshIndex] = None) -> None:
         """
             Render the mesh on the canvas.
 
+            The mesh is drawn as a base layer (tagged "mesh") that is only rebuilt when the
+            view changes (filter, line width, leaving the drawn region) or when the model has
+            been invalidated with invalidate_mesh(). Panning moves the existing items, zooming
+            scales them (unless fixed-size markers are drawn) and a display mode change
+            recolors them through their palette tags.
+            Selection highlighting is drawn as a separate overlay layer (tagged "selection")
+            and only the elements added to or removed from the selection are updated.
+
             Special rendering is applied to interface elements to show:
             - Diamond-shaped markers at interface locations
             - Red arrows indicating the direction of normal force
@@ -66,207 +138,660 @@ class CanvasView:
                 max_step: Maximum step number for color mapping
                 element_type_filter: List of element types to display, None means display all
                 line_width: Width for 1D elements
+                mesh_index: Flat geometry index of the model (built from nodes/elements if omitted)
             """
         if not nodes or not elements:
             return
 
-        # Clear the canvas
-        self.canvas.delete("all")
+        if mesh_index is None:
+            mesh_index = MeshIndex(nodes, elements)
 
-        # Draw elements
-        for element_id, element in elements.items():
-            # Check if the element should be displayed based on filter
-            if not self._should_display_element(element, element_type_filter):
-                continue
+        # Project every node to the screen (reused from the previous frame if the view is unchanged)
+        screen_x, screen_y = self.get_screen_coordinates(mesh_index)
 
-            # Get screen coordinates for each node
-            screen_coords = []
-            for node_id in element.nodes:
-                if node_id in nodes:
-                    node = nodes[node_id]
-                    screen_x, screen_y = self.model_to_screen(node.x, node.y)
-                    screen_coords.append((screen_x, screen_y))
+        mesh_key = self._get_mesh_key(element_type_filter, line_width)
+        zoom_changed = self.zoom_level != self._layer_zoom
 
-            # Skip if we don't have enough coordinates
-            if len(screen_coords) < 2:
+        # Nothing to do if the view, the layers and the selection are exactly as last drawn
+        if (not self._mesh_dirty and mesh_key == self._mesh_key and not zoom_changed
+                and (self.pan_offset_x, self.pan_offset_y) == self._layer_pan
+                and self.display_mode == self._layer_display_mode and not self._recolor_elements
+                and not self.is_dragging and selected_elements == self._drawn_selection):
+            return
+
+        if (self._mesh_dirty or mesh_key != self._mesh_key or not self._layer_covers_view()
+                or (zoom_changed and not self._layers_scalable())):
+            # Rebuild the base layer (this also clears any selection overlay), culling elements
+            # outside the visible area plus a margin that panning can reuse
+            self._cancel_pending_rows()
+            self.canvas.delete("all")
+            self._layer_region = self._get_visible_region(CULL_MARGIN)
+            rows = mesh_index.query_box(*self._layer_region)
+
+            # Large layers are drawn in chunks, the rest follows from the idle loop so input is not blocked
+            self._draw_mesh(mesh_index, screen_x, screen_y, element_type_filter, line_width,
+                            rows[:RENDER_CHUNK_SIZE])
+            if len(rows) > RENDER_CHUNK_SIZE:
+                self._pending_rows = (mesh_index, element_type_filter, line_width, rows, RENDER_CHUNK_SIZE)
+                self._pending_rows_id = self.canvas.after_idle(self._draw_pending_rows)
+            self._mesh_key = mesh_key
+            self._mesh_dirty = False
+            self._layer_zoom = self.zoom_level
+            self._layer_pan = (self.pan_offset_x, self.pan_offset_y)
+            self._layer_display_mode = self.display_mode
+            self._drawn_selection = set()
+        else:
+            # The base layer is still valid, it only has to follow the zoom, pan offset and display mode
+            self._transform_layers_to_view()
+            if self._recolor_elements:
+                self._recolor_element_items(mesh_index, self._recolor_elements)
+            if self._layer_display_mode != self.display_mode:
+                self._recolor_layers()
+        self._recolor_elements = set()
+
+        # Only update the overlay for elements whose selection state changed
+        removed = self._drawn_selection - selected_elements
+        added = selected_elements - self._drawn_selection
+        for element_id in removed:
+            self.canvas.delete(f"selected_{element_id}")
+        self._draw_selection_overlay(mesh_index, screen_x, screen_y, added,
+                                     element_type_filter, line_width)
+
+        # The outlines of all selected 2D elements form a few shared items, rebuilt when any of them changes
+        if self._outline_selection_changed(mesh_index, removed | added, element_type_filter):
+            self.canvas.delete("selection_outline")
+            self._draw_selection_outline(mesh_index, screen_x, screen_y, selected_elements,
+                                         element_type_filter)
+        self._drawn_selection = set(selected_elements)
+
+        # Draw selection box if dragging
+        if self.is_dragging:
+            self.draw_selection_box(
+                self.drag_start_x, self.drag_start_y,
+                self.locked_cursor_x, self.locked_cursor_y
+            )
+
+    def invalidate_mesh(self) -> None:
+        """Force the base mesh layer to be rebuilt on the next render (e.g. after model changes)."""
+        self._mesh_dirty = True
+
+    def _draw_pending_rows(self) -> None:
+        """Draw the next chunk of the mesh layer rows left over by the last rebuild."""
+        self._pending_rows_id = None
+        mesh_index, element_type_filter, line_width, rows, start = self._pending_rows
+        end = start + RENDER_CHUNK_SIZE
+
+        # Draw at the zoom/pan the layer is currently at, later renders transform it with the rest of the layer
+        screen_x, screen_y = self.project_nodes(mesh_index, self._layer_zoom, self._layer_pan)
+        self._draw_mesh(mesh_index, screen_x, screen_y, element_type_filter, line_width, rows[start:end])
+
+        # Keep the selection highlighting on top of the new items
+        self.canvas.tag_raise("selection")
+        self.canvas.tag_raise("selection_box")
+
+        if end < len(rows):
+            self._pending_rows = (mesh_index, element_type_filter, line_width, rows, end)
+            self._pending_rows_id = self.canvas.after_idle(self._draw_pending_rows)
+        else:
+            self._pending_rows = None
+
+    def _cancel_pending_rows(self) -> None:
+        """Stop drawing the chunks of a mesh layer that is being replaced."""
+        if self._pending_rows_id is not None:
+            self.canvas.after_cancel(self._pending_rows_id)
+            self._pending_rows_id = None
+        self._pending_rows = None
+
+    def invalidate_element_colors(self, element_ids: Iterable[int]) -> None:
+        """
+        Recolor the drawn items of some elements on the next render instead of rebuilding the mesh layer.
+
+        Args:
+            element_ids: IDs of the elements whose material or step changed
+        """
+        self._recolor_elements.update(element_ids)
+
+    def _get_mesh_key(self, element_type_filter, line_width) -> Tuple:
+        """
+        Build the key describing everything the base mesh layer depends on.
+
+        Args:
+            element_type_filter: List of element types to display, None means display all
+            line_width: Width for 1D elements
+
+        Returns:
+            Tuple that changes whenever the base layer must be redrawn
+        """
+        filter_key = None if element_type_filter is None else tuple(element_type_filter)
+        return (self.canvas.winfo_height(), filter_key, line_width)
+
+    def _get_visible_region(self, margin: float = 0.0) -> Tuple[float, float, float, float]:
+        """
+        Get the model-space rectangle shown on the canvas.
+
+        Args:
+            margin: Extra border on every side, as a fraction of the canvas size
+
+        Returns:
+            Tuple of (min_x, min_y, max_x, max_y) in model coordinates
+        """
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        left, top = self.screen_to_model(-width * margin, -height * margin)
+        right, bottom = self.screen_to_model(width * (1 + margin), height * (1 + margin))
+        return min(left, right), min(top, bottom), max(left, right), max(top, bottom)
+
+    def _layer_covers_view(self) -> bool:
+        """Check whether the drawn mesh layer still covers the whole visible area (e.g. after panning)."""
+        if self._layer_region is None:
+            return False
+        min_x, min_y, max_x, max_y = self._get_visible_region()
+        layer_min_x, layer_min_y, layer_max_x, layer_max_y = self._layer_region
+        return (layer_min_x <= min_x and max_x <= layer_max_x and
+                layer_min_y <= min_y and max_y <= layer_max_y)
+
+    def _layers_scalable(self) -> bool:
+        """Check whether the drawn layers can follow a zoom change by scaling (no fixed-size markers are drawn)."""
+        return not self.canvas.find_withtag("marker")
+
+    def _transform_layers_to_view(self) -> None:
+        """Scale and shift the mesh and selection layers from the zoom/pan they were drawn at to the current one."""
+        layer_pan_x, layer_pan_y = self._layer_pan
+        factor = self.zoom_level / self._layer_zoom
+        if factor != 1:
+            # Scale about the screen position of the model origin, which the zoom keeps fixed
+            origin_y = self.canvas.winfo_height() - layer_pan_y
+            self.canvas.scale("mesh", layer_pan_x, origin_y, factor, factor)
+            self.canvas.scale("selection", layer_pan_x, origin_y, factor, factor)
+            self._layer_zoom = self.zoom_level
+
+        dx = self.pan_offset_x - layer_pan_x
+        dy = self.pan_offset_y - layer_pan_y
+        if dx or dy:
+            # Screen Y grows downwards, so a positive Y pan moves items up
+            self.canvas.move("mesh", dx, -dy)
+            self.canvas.move("selection", dx, -dy)
+            self._layer_pan = (self.pan_offset_x, self.pan_offset_y)
+
+    def _recolor_layers(self) -> None:
+        """Recolor the mesh and selection layers for the current display mode, one call per palette color."""
+        prefix = "material_color" if self.display_mode == DisplayMode.MATERIAL else "step_color"
+        for color_index, color in enumerate(CANDE_COLORS):
+            self.canvas.itemconfigure(f"{prefix}_{color_index}", fill=color)
+        self._layer_display_mode = self.display_mode
+
+    def _recolor_element_items(self, mesh_index: MeshIndex, element_ids: Set[int]) -> None:
+        """
+        Move the drawn items of some elements to their current palette tags and fill color.
+
+        Args:
+            mesh_index: Flat geometry index of the model (with refreshed materials)
+            element_ids: IDs of the elements to recolor
+        """
+        if self.display_mode == DisplayMode.MATERIAL:
+            color_indices = mesh_index.material_color_index
+        else:
+            color_indices = mesh_index.step_color_index
+
+        canvas = self.canvas
+        for element_id in element_ids:
+            row = mesh_index.element_index.get(element_id)
+            if row is None or isinstance(mesh_index.elements[row], InterfaceElement):
                 continue
 
-            # Determine fill color based on display mode
-            if self.display_mode == DisplayMode.MATERIAL:
-                color_index = ((element.material - 1) % len(CANDE_COLORS))
-                fill_color = CANDE_COLORS[color_index]
-            else:  # Step mode
-                color_index = ((element.step - 1) % len(CANDE_COLORS))
-                fill_color = CANDE_COLORS[color_index]
+            color_tags = self._get_color_tags(mesh_index, row)
+            fill_color = CANDE_COLORS[color_indices[row]]
+            for tag in (f"element_{element_id}", f"selected_{element_id}"):
+                for item in canvas.find_withtag(tag):
+                    # Only the colored items carry palette tags (not the selection indicators)
+                    old_tags = [t for t in canvas.gettags(item) if t.startswith(("material_color_", "step_color_"))]
+                    if not old_tags:
+                        continue
+                    for old_tag in old_tags:
+                        canvas.dtag(item, old_tag)
+                    for color_tag in color_tags:
+                        canvas.addtag_withtag(color_tag, item)
+                    canvas.itemconfigure(item, fill=fill_color)
+
+    @staticmethod
+    def _get_color_tags(mesh_index: MeshIndex, row: int) -> Tuple[str, str]:
+        """
+        Get the palette tags of an element, used to recolor it when the display mode changes.
 
-            # Draw with thicker outline if selected
-            outline_width = 2 if element_id in selected_elements else 1
-            outline_color = "red" if element_id in selected_elements else "black"
+        Args:
+            mesh_index: Flat geometry index of the model
+            row: Element row in the mesh index
 
-            # Different rendering for 1D vs 2D vs Interface elements
-            if isinstance(element, Element1D) and len(screen_coords) == 2:
-                # For 1D elements (beams), draw a thick line
-                element_line_width = line_width * outline_width
+        Returns:
+            Tuple of (material color tag, step color tag)
+        """
+        return (f"material_color_{mesh_index.material_color_index[row]}",
+                f"step_color_{mesh_index.step_color_index[row]}")
 
-                # Create the line
-                self.canvas.create_line(
-                    screen_coords[0][0], screen_coords[0][1],
-                    screen_coords[1][0], screen_coords[1][1],
-                    fill=fill_color,
-                    width=element_line_width,
-                    tags=(f"element_{element_id}",)
-                )
+    def _get_element_fill_color(self, element: BaseElement) -> str:
+        """
+        Get the fill color for an element based on the display mode.
 
-                # Draw a selection indicator if the element is selected
-                if element_id in selected_elements:
-                    # Draw selection indicators at each end point
-                    self._draw_selection_indicator(screen_coords[0][0], screen_coords[0][1])
-                    self._draw_selection_indicator(screen_coords[1][0], screen_coords[1][1])
-                    # In the CanvasView.render_mesh method, for interface elements:
+        Args:
+            element: The element to color
 
-            elif isinstance(element, InterfaceElement) and len(element.nodes) >= 2:
-                # For interface elements, use consistent colors based on friction
-                friction = getattr(element, 'friction', 0.3)
+        Returns:
+            Color string from CANDE_COLORS
+        """
+        if isinstance(element, InterfaceElement):
+            # For interface elements, use consistent colors based on friction
+            friction = getattr(element, 'friction', 0.3)
 
-                # Get color index from model
-                if hasattr(self, 'model'):
-                    color_index = self.model.get_friction_color_index(friction)
-                else:
-                    # Fallback if model reference is not available
-                    color_index = int(friction * 10) % len(CANDE_COLORS)
+            # Get color index from model
+            if hasattr(self, 'model'):
+                color_index = self.model.get_friction_color_index(friction)
+            else:
+                # Fallback if model reference is not available
+                color_index = int(friction * 10) % len(CANDE_COLORS)
+            return CANDE_COLORS[color_index]
 
-                fill_color = CANDE_COLORS[color_index]
+        if self.display_mode == DisplayMode.MATERIAL:
+            color_index = ((element.material - 1) % len(CANDE_COLORS))
+        else:  # Step mode
+            color_index = ((element.step - 1) % len(CANDE_COLORS))
+        return CANDE_COLORS[color_index]
 
-                # IMPORTANT: For interface elements, always use normal outline (never show as selected)
-                # This avoids confusing users since interfaces can't be modified
-                outline_width = 1
-                outline_color = "black"
-
-                # For interface elements, draw a diamond shape
-                # Get coordinates for interface element nodes (only need first two nodes for placement)
-                screen_coords = []
-                for node_id in element.nodes[:2]:  # Just use I and J nodes for rendering
-                    if node_id in nodes:
-                        node = nodes[node_id]
-                        screen_x, screen_y = self.model_to_screen(node.x, node.y)
-                        screen_coords.append((screen_x, screen_y))
-
-                # Skip if we don't have enough coordinates
-                if len(screen_coords) < 2:
-                    continue
+    def get_screen_coordinates(self, mesh_index: MeshIndex) -> Tuple[List[float], List[float]]:
+        """
+        Get the screen coordinates of all nodes, projecting them only when the mesh or view changed.
 
-                # Calculate average position (they should be the same, but just in case)
-                avg_x = sum(x for x, _ in screen_coords) / len(screen_coords)
-                avg_y = sum(y for _, y in screen_coords) / len(screen_coords)
+        Args:
+            mesh_index: Flat geometry index of the model
 
-                # Draw interface marker (diamond shape)
-                size = 8  # Size of marker
-                self.canvas.create_polygon(
-                    avg_x, avg_y - size,
-                           avg_x + size, avg_y,
-                    avg_x, avg_y + size,
-                           avg_x - size, avg_y,
+        Returns:
+            Tuple of (screen_x, screen_y) lists aligned with the mesh index node rows
+        """
+        projection_key = (mesh_index, self.zoom_level, self.pan_offset_x, self.pan_offset_y,
+                          self.canvas.winfo_height())
+        if projection_key != self._projection_key:
+            self._projection = self.project_nodes(mesh_index)
+            self._projection_key = projection_key
+        return self._projection
+
+    def project_nodes(self, mesh_index: MeshIndex, zoom_level: Optional[float] = None,
+                      pan_offset: Optional[Tuple[float, float]] = None) -> Tuple[List[float], List[float]]:
+        """
+        Convert all node coordinates of the mesh index to screen coordinates in one pass.
+
+        Args:
+            mesh_index: Flat geometry index of the model
+            zoom_level: Zoom level to project with (the current one if omitted)
+            pan_offset: Pan offset (x, y) to project with (the current one if omitted)
+
+        Returns:
+            Tuple of (screen_x, screen_y) lists aligned with the mesh index node rows
+        """
+        if zoom_level is None:
+            zoom_level = self.zoom_level
+        if pan_offset is None:
+            pan_offset = (self.pan_offset_x, self.pan_offset_y)
+
+        # Same transformation as model_to_screen, with the per-frame terms hoisted out of the loop
+        offset_x, pan_offset_y = pan_offset
+        offset_y = self.canvas.winfo_height() - pan_offset_y
+        screen_x = [x * zoom_level + offset_x for x in mesh_index.node_x]
+        screen_y = [offset_y - y * zoom_level for y in mesh_index.node_y]
+        return screen_x, screen_y
+
+    def _draw_mesh(self, mesh_index: MeshIndex, screen_x: List[float], screen_y: List[float],
+                   element_type_filter, line_width, rows: Optional[Sequence[int]] = None) -> None:
+        """
+        Draw the base mesh layer (displayed elements in their unselected state).
+
+        Args:
+            mesh_index: Flat geometry index of the model
+            screen_x: Screen X coordinate of each node row
+            screen_y: Screen Y coordinate of each node row
+            element_type_filter: List of element types to display, None means display all
+            line_width: Width for 1D elements
+            rows: Element rows to draw, in element order (all elements if omitted)
+        """
+        # Palette indices are precomputed per element for the current display mode
+        if self.display_mode == DisplayMode.MATERIAL:
+            color_indices = mesh_index.material_color_index
+        else:
+            color_indices = mesh_index.step_color_index
+
+        if rows is None:
+            rows = range(len(mesh_index.elements))
+        displayed = mesh_index.filter_mask(element_type_filter)
+
+        for row in rows:
+            # Check if the element should be displayed based on filter
+            if not displayed[row]:
+                continue
+
+            element_id = mesh_index.element_ids[row]
+            element = mesh_index.elements[row]
+            node_rows = mesh_index.element_node_indices[row]
+
+            # Skip if we don't have enough coordinates
+            if len(node_rows) < 2:
+                continue
+
+            if isinstance(element, InterfaceElement):
+                fill_color = self._get_element_fill_color(element)
+            else:
+                fill_color = CANDE_COLORS[color_indices[row]]
+            tags = ("mesh", f"element_{element_id}") + self._get_color_tags(mesh_index, row)
+
+            # Different rendering for 1D vs 2D vs Interface elements
+            if isinstance(element, Element1D) and len(node_rows) == 2:
+                # For 1D elements (beams), draw a thick line
+                start, end = node_rows
+                self.canvas.create_line(
+                    screen_x[start], screen_y[start],
+                    screen_x[end], screen_y[end],
                     fill=fill_color,
-                    outline=outline_color,
-                    width=outline_width,
-                    tags=(f"element_{element_id}",)
+                    width=line_width,
+                    tags=tags
                 )
 
-                # After drawing the interface diamond:
-                if isinstance(element, InterfaceElement):
-                    # Draw improved angle indicator with a longer line and better arrow
-                    indicator_length = 20  # Make this longer to be more visible
-                    angle_rad = math.radians(element.angle)
-
-                    # Calculate arrow endpoint
-                    indicator_x = avg_x + indicator_length * math.cos(angle_rad)
-                    # Flip the y direction since canvas has y increasing downward
-                    indicator_y = avg_y - indicator_length * math.sin(angle_rad)
-
-                    # Draw the main arrow line
-                    self.canvas.create_line(
-                        avg_x, avg_y, indicator_x, indicator_y,
-                        fill="red",  # Use a bright color
-                        width=2,  # Make the line thicker
-                        arrow=tk.LAST,  # Add arrowhead at the end
-                        arrowshape=(10, 12, 5),  # Customize arrowhead shape (dx, dy, z)
-                        tags=(f"angle_indicator_{element_id}",)
-                    )
-
-                    # Add a small text label showing the angle value and friction
-                    # Position the text offset from the arrow to avoid overlap
-                    offset_factor = 1.3
-                    text_x = avg_x + (indicator_length * offset_factor) * math.cos(angle_rad)
-                    text_y = avg_y - (indicator_length * offset_factor) * math.sin(angle_rad)
-
-                    self.canvas.create_text(
-                        text_x, text_y,
-                        text=f"{element.angle:.0f}°",
-                        fill="blue",
-                        font=("Arial", 8, "bold"),  # Make font bold for better visibility
-                        tags=(f"angle_text_{element_id}",)
-                    )
-
-                    # Material ID text
-                    # Calculate position on opposite side of diamond from the angle indicator
-                    opposite_angle_rad = angle_rad + math.pi  # Opposite direction from angle indicator
-                    text_distance = indicator_length * 0.8  # Same offset factor as for angle text
-                    material_text_x = avg_x + text_distance * math.cos(opposite_angle_rad)
-                    material_text_y = avg_y - text_distance * math.sin(opposite_angle_rad)
-
-                    # Draw the material ID text with the same color as the diamond
-                    self.canvas.create_text(
-                        material_text_x, material_text_y,
-                        text=f"{element.material}",
-                        fill=fill_color,  # Use the same color as the diamond
-                        font=("Arial", 8, "bold"),
-                        tags=(f"material_text_{element_id}",)
-                    )
-
-                    # Add a perpendicular tick mark to indicate the interface plane
-                    perp_length = 10
-                    perp_angle_rad = angle_rad + math.pi / 2  # Perpendicular to force direction
-
-                    perp1_x = avg_x + perp_length * math.cos(perp_angle_rad)
-                    perp1_y = avg_y - perp_length * math.sin(perp_angle_rad)
-                    perp2_x = avg_x - perp_length * math.cos(perp_angle_rad)
-                    perp2_y = avg_y + perp_length * math.sin(perp_angle_rad)
-
-                    # Draw the interface plane indicator line
-                    self.canvas.create_line(
-                        perp1_x, perp1_y, perp2_x, perp2_y,
-                        fill="green",  # Different color for interface plane
-                        width=2,
-                        dash=(3, 2),  # Dashed line
-                        tags=(f"plane_indicator_{element_id}",)
-                    )
-
-                # Draw a selection indicator if the element is selected
-                if element_id in selected_elements:
-                    self._draw_selection_indicator(avg_x, avg_y)
+            elif isinstance(element, InterfaceElement) and len(element.nodes) >= 2:
+                # Interface elements are always drawn with a normal outline (never shown as selected)
+                # This avoids confusing users since interfaces can't be modified
+                position = self._get_interface_position(node_rows, screen_x, screen_y)
+                if position is not None:
+                    self._draw_interface_element(element_id, element, position, fill_color)
             else:
                 # For 2D elements, create a polygon
-                polygon_coords = [coord for point in screen_coords for coord in point]
+                polygon_coords = [coord for row in node_rows for coord in (screen_x[row], screen_y[row])]
 
                 self.canvas.create_polygon(
                     polygon_coords,
                     fill=fill_color,
-                    outline=outline_color,
-                    width=outline_width,
-                    tags=(f"element_{element_id}",)
+                    outline="black",
+                    width=1,
+                    tags=tags
                 )
 
-        # Draw selection box if dragging
-        if self.is_dragging:
-            self.draw_selection_box(
-                self.drag_start_x, self.drag_start_y,
-                self.locked_cursor_x, self.locked_cursor_y
-            )
+    @staticmethod
+    def _get_interface_position(node_rows: Tuple[int, ...], screen_x: List[float],
+                                screen_y: List[float]) -> Optional[Tuple[float, float]]:
+        """
+        Get the screen position of an interface element marker.
+
+        Args:
+            node_rows: Node rows of the interface element
+            screen_x: Screen X coordinate of each node row
+            screen_y: Screen Y coordinate of each node row
+
+        Returns:
+            Screen (x, y) of the marker, or None if the I and J nodes are unavailable
+        """
+        # Just use I and J nodes for placement
+        rows = node_rows[:2]
+
+        # Skip if we don't have enough coordinates
+        if len(rows) < 2:
+            return None
+
+        # Calculate average position (they should be the same, but just in case)
+        avg_x = sum(screen_x[row] for row in rows) / len(rows)
+        avg_y = sum(screen_y[row] for row in rows) / len(rows)
+        return avg_x, avg_y
+
+    def _draw_interface_element(self, element_id: int, element: InterfaceElement,
+                                position: Tuple[float, float], fill_color: str) -> None:
+        """
+        Draw an interface element marker with its angle indicator and labels.
+
+        Args:
+            element_id: ID of the interface element
+            element: The interface element
+            position: Screen position of the marker
+            fill_color: Fill color of the diamond marker
+        """
+        avg_x, avg_y = position
+
+        # Draw interface marker (diamond shape)
+        size = 8  # Size of marker
+        self.canvas.create_polygon(
+            avg_x, avg_y - size,
+                   avg_x + size, avg_y,
+            avg_x, avg_y + size,
+                   avg_x - size, avg_y,
+            fill=fill_color,
+            outline="black",
+            width=1,
+            tags=("mesh", "marker", f"element_{element_id}")
+        )
+
+        # Draw improved angle indicator with a longer line and better arrow
+        indicator_length = 20  # Make this longer to be more visible
+        angle_rad = math.radians(element.angle)
+
+        # Calculate arrow endpoint
+        indicator_x = avg_x + indicator_length * math.cos(angle_rad)
+        # Flip the y direction since canvas has y increasing downward
+        indicator_y = avg_y - indicator_length * math.sin(angle_rad)
+
+        # Draw the main arrow line
+        self.canvas.create_line(
+            avg_x, avg_y, indicator_x, indicator_y,
+            fill="red",  # Use a bright color
+            width=2,  # Make the line thicker
+            arrow=tk.LAST,  # Add arrowhead at the end
+            arrowshape=(10, 12, 5),  # Customize arrowhead shape (dx, dy, z)
+            tags=("mesh", "marker", f"angle_indicator_{element_id}")
+        )
+
+        # Add a small text label showing the angle value and friction
+        # Position the text offset from the arrow to avoid overlap
+        offset_factor = 1.3
+        text_x = avg_x + (indicator_length * offset_factor) * math.cos(angle_rad)
+        text_y = avg_y - (indicator_length * offset_factor) * math.sin(angle_rad)
+
+        self.canvas.create_text(
+            text_x, text_y,
+            text=f"{element.angle:.0f}°",
+            fill="blue",
+            font=("Arial", 8, "bold"),  # Make font bold for better visibility
+            tags=("mesh", "marker", f"angle_text_{element_id}")
+        )
+
+        # Material ID text
+        # Calculate position on opposite side of diamond from the angle indicator
+        opposite_angle_rad = angle_rad + math.pi  # Opposite direction from angle indicator
+        text_distance = indicator_length * 0.8  # Same offset factor as for angle text
+        material_text_x = avg_x + text_distance * math.cos(opposite_angle_rad)
+        material_text_y = avg_y - text_distance * math.sin(opposite_angle_rad)
+
+        # Draw the material ID text with the same color as the diamond
+        self.canvas.create_text(
+            material_text_x, material_text_y,
+            text=f"{element.material}",
+            fill=fill_color,  # Use the same color as the diamond
+            font=("Arial", 8, "bold"),
+            tags=("mesh", "marker", f"material_text_{element_id}")
+        )
 
-        # Update display immediately to improve responsiveness
-        self.canvas.update_idletasks()
+        # Add a perpendicular tick mark to indicate the interface plane
+        perp_length = 10
+        perp_angle_rad = angle_rad + math.pi / 2  # Perpendicular to force direction
 
-    def _draw_selection_indicator(self, x: float, y: float, radius: int = 4) -> None:
+        perp1_x = avg_x + perp_length * math.cos(perp_angle_rad)
+        perp1_y = avg_y - perp_length * math.sin(perp_angle_rad)
+        perp2_x = avg_x - perp_length * math.cos(perp_angle_rad)
+        perp2_y = avg_y + perp_length * math.sin(perp_angle_rad)
+
+        # Draw the interface plane indicator line
+        self.canvas.create_line(
+            perp1_x, perp1_y, perp2_x, perp2_y,
+            fill="green",  # Different color for interface plane
+            width=2,
+            dash=(3, 2),  # Dashed line
+            tags=("mesh", "marker", f"plane_indicator_{element_id}")
+        )
+
+    def _draw_selection_overlay(self, mesh_index: MeshIndex, screen_x: List[float], screen_y: List[float],
+                                selected_elements, element_type_filter, line_width) -> None:
+        """
+        Draw the selection highlighting on top of the base mesh layer.
+
+        Args:
+            mesh_index: Flat geometry index of the model
+            screen_x: Screen X coordinate of each node row
+            screen_y: Screen Y coordinate of each node row
+            selected_elements: Set of selected element IDs
+            element_type_filter: List of element types to display, None means display all
+            line_width: Width for 1D elements
+        """
+        element_index = mesh_index.element_index
+        displayed = mesh_index.filter_mask(element_type_filter)
+        for element_id in selected_elements:
+            index = element_index.get(element_id)
+            if index is None or not displayed[index]:
+                continue
+            element = mesh_index.elements[index]
+
+            node_rows = mesh_index.element_node_indices[index]
+            if len(node_rows) < 2:
+                continue
+
+            tags = ("selection", f"selected_{element_id}")
+            if isinstance(element, InterfaceElement):
+                position = self._get_interface_position(node_rows, screen_x, screen_y)
+                if position is not None:
+                    self._draw_selection_indicator(*position, tags=tags)
+            elif isinstance(element, Element1D) and len(node_rows) == 2:
+                # Selected beams are drawn twice as thick with indicators at each end point
+                start, end = node_rows
+                self.canvas.create_line(
+                    screen_x[start], screen_y[start],
+                    screen_x[end], screen_y[end],
+                    fill=self._get_element_fill_color(element),
+                    width=line_width * 2,
+                    tags=tags + self._get_color_tags(mesh_index, index)
+                )
+                self._draw_selection_indicator(screen_x[start], screen_y[start], tags=tags)
+                self._draw_selection_indicator(screen_x[end], screen_y[end], tags=tags)
+            # Selected 2D elements are outlined together by _draw_selection_outline
+
+    def _get_outline_rows(self, mesh_index: MeshIndex, row: int,
+                          element_type_filter) -> Optional[Tuple[int, ...]]:
+        """
+        Get the node rows of an element that is highlighted by the shared selection outline.
+
+        Args:
+            mesh_index: Flat geometry index of the model
+            row: Element row in the mesh index
+            element_type_filter: List of element types to display, None means display all
+
+        Returns:
+            Node rows of the element's outline, or None if the element is not outlined
+        """
+        element = mesh_index.elements[row]
+        node_rows = mesh_index.element_node_indices[row]
+        if (len(node_rows) < 2 or isinstance(element, InterfaceElement)
+                or (isinstance(element, Element1D) and len(node_rows) == 2)
+                or not mesh_index.filter_mask(element_type_filter)[row]):
+            return None
+        return node_rows
+
+    def _outline_selection_changed(self, mesh_index: MeshIndex, changed_elements: Set[int],
+                                   element_type_filter) -> bool:
+        """
+        Check whether any element whose selection state changed is part of the selection outline.
+
+        Args:
+            mesh_index: Flat geometry index of the model
+            changed_elements: IDs of elements added to or removed from the selection
+            element_type_filter: List of element types to display, None means display all
+
+        Returns:
+            True if the selection outline has to be rebuilt
+        """
+        element_index = mesh_index.element_index
+        for element_id in changed_elements:
+            row = element_index.get(element_id)
+            if row is not None and self._get_outline_rows(mesh_index, row, element_type_filter):
+                return True
+        return False
+
+    def _draw_selection_outline(self, mesh_index: MeshIndex, screen_x: List[float], screen_y: List[float],
+                                selected_elements, element_type_filter) -> None:
+        """
+        Outline the selected 2D elements in red with one polyline per connected group of edges.
+
+        Each polyline walks its edges depth first and backtracks over edges it has already drawn,
+        so a large selection becomes a handful of canvas items instead of one polygon per element.
+
+        Args:
+            mesh_index: Flat geometry index of the model
+            screen_x: Screen X coordinate of each node row
+            screen_y: Screen Y coordinate of each node row
+            selected_elements: Set of selected element IDs
+            element_type_filter: List of element types to display, None means display all
+        """
+        # Collect the unique edges of all outlined elements as an adjacency list
+        adjacency: Dict[int, List[int]] = {}
+        edges: Set[Tuple[int, int]] = set()
+        element_index = mesh_index.element_index
+        for element_id in selected_elements:
+            row = element_index.get(element_id)
+            if row is None:
+                continue
+            node_rows = self._get_outline_rows(mesh_index, row, element_type_filter)
+            if not node_rows:
+                continue
+            edge_count = len(node_rows) if len(node_rows) > 2 else 1
+            for i in range(edge_count):
+                start = node_rows[i]
+                end = node_rows[(i + 1) % len(node_rows)]
+                edge = (start, end) if start < end else (end, start)
+                if start == end or edge in edges:
+                    continue
+                edges.add(edge)
+                adjacency.setdefault(start, []).append(end)
+                adjacency.setdefault(end, []).append(start)
+
+        # Walk every connected group of edges as a single polyline
+        visited: Set[Tuple[int, int]] = set()
+        next_neighbor = dict.fromkeys(adjacency, 0)
+        for origin in adjacency:
+            path = [origin]
+            path_end = 1  # Length of the path up to the last newly drawn edge
+            stack = [origin]
+            while stack:
+                node = stack[-1]
+                neighbors = adjacency[node]
+                # Advance to the next edge of this node that has not been drawn yet
+                while next_neighbor[node] < len(neighbors):
+                    neighbor = neighbors[next_neighbor[node]]
+                    edge = (node, neighbor) if node < neighbor else (neighbor, node)
+                    if edge not in visited:
+                        break
+                    next_neighbor[node] += 1
+                else:
+                    # All edges of this node are drawn: backtrack along the edge we came from
+                    stack.pop()
+                    if stack:
+                        path.append(stack[-1])
+                    continue
+
+                visited.add(edge)
+                path.append(neighbor)
+                path_end = len(path)
+                stack.append(neighbor)
+
+            if path_end < 2:
+                continue
+            coords = [coord for row in path[:path_end] for coord in (screen_x[row], screen_y[row])]
+            self.canvas.create_line(
+                coords,
+                fill="red",
+                width=2,
+                tags=("selection", "selection_outline")
+            )
+
+    def _draw_selection_indicator(self, x: float, y: float, radius: int = 4,
+                                  tags: Tuple[str, ...] = ("selection",)) -> None:
         """
         Draw a small circle to indicate selection points.
 
@@ -274,12 +799,14 @@ class CanvasView:
             x: X coordinate
             y: Y coordinate
             radius: Radius of the indicator circle
+            tags: Canvas tags for the indicator
         """
         self.canvas.create_oval(
             x - radius, y - radius,
             x + radius, y + radius,
             fill="red",
-            outline="red"
+            outline="red",
+            tags=tags + ("marker",)
         )
 
     def draw_selection_box(self, start_x: float, start_y: float,
@@ -293,7 +820,11 @@ class CanvasView:
             end_x: Ending X coordinate
             end_y: Ending Y coordinate
         """
-        self.canvas.delete("selection_box")
+        # Move the existing box while dragging, only create it the first time
+        if self.canvas.find_withtag("selection_box"):
+            self.canvas.coords("selection_box", start_x, start_y, end_x, end_y)
+            return
+
         self.canvas.create_rectangle(
             start_x, start_y, end_x, end_y,
             outline="blue",
@@ -396,25 +927,12 @@ class CanvasView:
         Returns:
             True if the point is inside the polygon, False otherwise
         """
-        n = len(polygon)
-        inside = False
-
-        p1x, p1y = polygon[0]
-        for i in range(1, n + 1):
-            p2x, p2y = polygon[i % n]
-            if y > min(p1y, p2y):
-                if y <= max(p1y, p2y):
-                    if x <= max(p1x, p2x):
-                        if p1y != p2y:
-                            xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                        if p1x == p2x or x <= xinters:
-                            inside = not inside
-            p1x, p1y = p2x, p2y
-
-        return inside
+        xs = [px for px, _ in polygon]
+        ys = [py for _, py in polygon]
+        return point_in_polygon_rows(x, y, range(len(polygon)), xs, ys)
 
     def point_near_line(self, x: float, y: float, line_start: Tuple[float, float],
-                        line_end: Tuple[float, float], threshold: float = None) -> bool:
+                        line_end: Tuple[float, float], threshold: float = LINE_ELEMENT_WIDTH * 2) -> bool:
         """
         Check if a point is near a line segment.
 
@@ -423,52 +941,57 @@ class CanvasView:
             y: Y coordinate of the point
             line_start: Start point of the line (x, y)
             line_end: End point of the line (x, y)
-            threshold: Maximum distance to consider a point near the line
+            threshold: Maximum distance to consider a point near the line (defaults to twice the line width)
 
         Returns:
             True if the point is near the line, False otherwise
         """
-        # Use the passed threshold or default to LINE_ELEMENT_WIDTH * 2
-        if threshold is None:
-            threshold = LINE_ELEMENT_WIDTH * 2
-
         # Extract line start and end points
         x1, y1 = line_start
         x2, y2 = line_end
 
-        # Calculate the length of the line segment
-        line_length = math.sqrt((x2 - x1)**2 + (y2 - y1)**2)
-
-        # If the line has zero length, check distance to the point
-        if line_length == 0:
-            return math.sqrt((x - x1)**2 + (y - y1)**2) <= threshold
+        # Reject points outside the segment's bounding box grown by the threshold
+        if x1 < x2:
+            if x < x1 - threshold or x > x2 + threshold:
+                return False
+        elif x < x2 - threshold or x > x1 + threshold:
+            return False
+        if y1 < y2:
+            if y < y1 - threshold or y > y2 + threshold:
+                return False
+        elif y < y2 - threshold or y > y1 + threshold:
+            return False
 
-        # Calculate the normalized direction vector of the line
-        dx, dy = (x2 - x1) / line_length, (y2 - y1) / line_length
+        # Segment vector and its squared length, computed once (no normalized direction needed)
+        dx = x2 - x1
+        dy = y2 - y1
+        length_squared = dx * dx + dy * dy
 
-        # Calculate the vector from line start to the point
-        px, py = x - x1, y - y1
+        # Vector from line start to the point
+        px = x - x1
+        py = y - y1
 
-        # Project the point onto the line
-        projection = px * dx + py * dy
+        # Distances are compared squared, so no square root is taken
+        threshold_squared = threshold * threshold
 
-        # Clamp the projection to the line segment
-        projection = max(0, min(projection, line_length))
+        # If the line has zero length, check distance to the point
+        if length_squared == 0:
+            return px * px + py * py <= threshold_squared
 
-        # Calculate the closest point on the line
-        closest_x = x1 + projection * dx
-        closest_y = y1 + projection * dy
+        # Project the point onto the line, clamped to the segment (as a fraction of its length)
+        t = max(0.0, min((px * dx + py * dy) / length_squared, 1.0))
 
         # Calculate the distance from the point to the closest point on the line
-        distance = math.sqrt((x - closest_x)**2 + (y - closest_y)**2)
-
-        return distance <= threshold
+        offset_x = px - t * dx
+        offset_y = py - t * dy
+        return offset_x * offset_x + offset_y * offset_y <= threshold_squared
 
     def find_element_at_position(self, screen_x: float, screen_y: float,
                                  nodes: Dict[int, Node],
                                  elements: Dict[int, BaseElement],
-                                 element_type_filter: Optional[str] = None,
-                                 line_width: int = LINE_ELEMENT_WIDTH) -> Optional[int]:
+                                 element_type_filter: Union[None, str, Sequence[str]] = None,
+                                 line_width: int = LINE_ELEMENT_WIDTH,
+                                 mesh_index: Optional[MeshIndex] = None) -> Optional[int]:
         """
         Find the element at the given screen position.
 
@@ -477,36 +1000,52 @@ class CanvasView:
             screen_y: Screen Y coordinate
             nodes: Dictionary of nodes
             elements: Dictionary of elements
-            element_type_filter: Optional filter for element type ("1D", "2D", or None)
+            element_type_filter: List of element types to display ("1D", "2D", "Interface"), None means
+                display all; only displayed elements can be hit
             line_width: Screen beam element width
+            mesh_index: Flat geometry index of the model (built from nodes/elements if omitted)
 
         Returns:
             Element ID if found, None otherwise
         """
-        model_x, model_y = self.screen_to_model(screen_x, screen_y)
+        if mesh_index is None:
+            mesh_index = MeshIndex(nodes, elements)
 
-        # Check each element
-        for element_id, element in elements.items():
-            # Apply element type filter
-            if element_type_filter == "1D" and not isinstance(element, Element1D):
-                continue
-            elif element_type_filter == "2D" and not isinstance(element, Element2D):
+        model_x, model_y = self.screen_to_model(screen_x, screen_y)
+        node_screen_x, node_screen_y = self.get_screen_coordinates(mesh_index)
+        node_x = mesh_index.node_x
+        node_y = mesh_index.node_y
+
+        # Only elements whose bounding box lies within the largest pick threshold can be hit
+        tolerance = max(line_width * 2, INTERFACE_PICK_RADIUS) / self.zoom_level
+        element_ids = mesh_index.element_ids
+        elements_by_row = mesh_index.elements
+        element_node_indices = mesh_index.element_node_indices
+        element_min_x = mesh_index.element_min_x
+        element_min_y = mesh_index.element_min_y
+        element_max_x = mesh_index.element_max_x
+        element_max_y = mesh_index.element_max_y
+        displayed = mesh_index.filter_mask(element_type_filter)
+
+        # Check each candidate element (rows are sorted, so the first match wins as before)
+        for row in mesh_index.query_point(model_x, model_y, tolerance):
+            # Elements hidden by the type filter can't be picked
+            if not displayed[row]:
                 continue
 
-            # Get the nodes for this element
-            element_nodes = [nodes[node_id] for node_id in element.nodes if node_id in nodes]
+            element_id = element_ids[row]
+            element = elements_by_row[row]
+            node_rows = element_node_indices[row]
 
             # Handle 1D elements (2 nodes)
-            if isinstance(element, Element1D) and len(element_nodes) == 2:
-                # Convert to screen coordinates for threshold comparison
-                node1_screen_x, node1_screen_y = self.model_to_screen(element_nodes[0].x, element_nodes[0].y)
-                node2_screen_x, node2_screen_y = self.model_to_screen(element_nodes[1].x, element_nodes[1].y)
+            if isinstance(element, Element1D) and len(node_rows) == 2:
+                start, end = node_rows
 
                 # Check if point is near the line
                 if self.point_near_line(
                     screen_x, screen_y,
-                    (node1_screen_x, node1_screen_y),
-                    (node2_screen_x, node2_screen_y),
+                    (node_screen_x[start], node_screen_y[start]),
+                    (node_screen_x[end], node_screen_y[end]),
                     threshold=line_width * 2  # Double the line width as threshold
                 ):
                     return element_id
@@ -514,53 +1053,24 @@ class CanvasView:
             # Handle interface elements (3 nodes)
             elif isinstance(element, InterfaceElement):
                 # For interface elements, check distance to the marker position
-                avg_x = sum(node.x for node in element_nodes[:2]) / 2
-                avg_y = sum(node.y for node in element_nodes[:2]) / 2
-
-                # Convert to screen coordinates
-                avg_screen_x, avg_screen_y = self.model_to_screen(avg_x, avg_y)
+                avg_screen_x = sum(node_screen_x[row] for row in node_rows[:2]) / 2
+                avg_screen_y = sum(node_screen_y[row] for row in node_rows[:2]) / 2
 
                 # Check if point is near the marker (use a simple distance check)
-                distance = math.sqrt((screen_x - avg_screen_x) ** 2 + (screen_y - avg_screen_y) ** 2)
-                if distance <= 10:  # Adjust threshold as needed
+                distance = math.hypot(screen_x - avg_screen_x, screen_y - avg_screen_y)
+                if distance <= INTERFACE_PICK_RADIUS:
                     return element_id
 
             # Handle 2D elements (3+ nodes)
-            elif len(element_nodes) >= 3:
-                # Create a polygon from the nodes
-                polygon = [(node.x, node.y) for node in element_nodes]
+            elif len(node_rows) >= 3:
+                # Candidates come from tolerance-grown boxes, so first reject points outside the
+                # element's own bounding box before the ray casting test
+                if not (element_min_x[row] <= model_x <= element_max_x[row]
+                        and element_min_y[row] <= model_y <= element_max_y[row]):
+                    continue
 
-                # Check if the point is inside the polygon
-                if self.point_in_polygon(model_x, model_y, polygon):
+                # Check if the point is inside the polygon formed by the nodes
+                if point_in_polygon_rows(model_x, model_y, node_rows, node_x, node_y):
                     return element_id
 
         return None
-
-    def _should_display_element(self, element, element_type_filter):
-        """
-        Check if an element should be displayed based on the filter.
-
-        Args:
-            element: The element to check
-            element_type_filter: List of element types to display, None means display all
-
-        Returns:
-            True if the element should be displayed, False otherwise
-        """
-        # If no filter or None, show all elements
-        if element_type_filter is None:
-            return True
-
-        # If empty filter list, show nothing
-        if element_type_filter == []:
-            return False
-
-        # Check element type against the filter list
-        if "1D" in element_type_filter and isinstance(element, Element1D):
-            return True
-        if "2D" in element_type_filter and isinstance(element, Element2D):
-            return True
-        if "Interface" in element_type_filter and isinstance(element, InterfaceElement):
-            return True
-
-        return False
@@ -269,6 +269,16 @@ class MainWindow:
         """
         self.status_var.set(message)
 
+    def show_input_error(self, message: str) -> None:
+        """
+        Report an invalid input in the status bar with a bell instead of a modal dialog.
+
+        Args:
+            message: The message to display
+        """
+        self.status_var.set(message)
+        self.root.bell()
+
     def update_coordinates(self, x: float, y: float) -> None:
         """
         Update the coordinates display.